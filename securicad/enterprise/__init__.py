@@ -12,11 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from securicad.enterprise.cache import ResultCache
 from securicad.enterprise.client import Client
 from securicad.enterprise.models import ModelInfo
 from securicad.enterprise.organizations import Organization
 from securicad.enterprise.projects import AccessLevel, Project
+from securicad.enterprise.results import ResultSet, SimulationResult
 from securicad.enterprise.scenarios import Scenario
+from securicad.enterprise.scheduler import Priority, SimulationScheduler
 from securicad.enterprise.simulations import Simulation
 from securicad.enterprise.users import Role, User
 
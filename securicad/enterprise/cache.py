@@ -0,0 +1,164 @@
+# Copyright 2020-2021 Foreseeti AB <https://foreseeti.com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
+
+from securicad.enterprise.results import SimulationResult
+
+
+class ResultCache:
+    """Caches the results of finished simulations on disk.
+
+    The results of a finished simulation never change, so they are stored
+    gzip-compressed under ``directory`` and served from there on later calls.
+    Each top-level section is stored as its own JSON text, so that a cached
+    result can be loaded without parsing the sections that are not used.
+
+    Every entry is one file, named by a hash of the server URL, the project id
+    and the simulation id, and there is no shared index, so several processes
+    can use the same directory. The modification time of a file is the last
+    time it was accessed, and the least recently used files are evicted when
+    their total size exceeds ``max_size`` bytes.
+    """
+
+    SUFFIX = ".json.gz"
+
+    def __init__(self, directory: Union[str, Path], max_size: int = 2**30) -> None:
+        self.directory = Path(directory)
+        self.max_size = max_size
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def __get_path(self, server: str, pid: str, simid: str) -> Path:
+        key = f"{server}|{pid}/{simid}"
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self.directory / f"{digest}{ResultCache.SUFFIX}"
+
+    def contains(self, server: str, pid: str, simid: str) -> bool:
+        return self.__get_path(server, pid, simid).exists()
+
+    def get(self, server: str, pid: str, simid: str) -> Optional[SimulationResult]:
+        path = self.__get_path(server, pid, simid)
+        try:
+            with gzip.open(path, mode="rt", encoding="utf-8") as f:
+                raw_sections = json.load(f)["sections"]
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError):
+            ResultCache.__unlink(path)
+            return None
+        try:
+            # Persist the access time for eviction
+            os.utime(path)
+        except OSError:
+            pass
+        return SimulationResult(raw_sections=raw_sections)
+
+    def put(self, server: str, pid: str, simid: str, result: Mapping[str, Any]) -> None:
+        if not isinstance(result, SimulationResult):
+            result = SimulationResult(dict(result))
+        path = self.__get_path(server, pid, simid)
+        # Unique per writer, so that concurrent writers do not share a file
+        tmp_path = path.with_name(
+            f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        with gzip.open(tmp_path, mode="wt", encoding="utf-8") as f:
+            json.dump({"sections": result._get_raw_sections()}, f)
+        os.replace(tmp_path, path)
+        self.__evict()
+
+    @staticmethod
+    def __unlink(path: Union[str, Path]) -> None:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+    def __evict(self) -> None:
+        entries: List[Tuple[int, int, str]] = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.name.endswith(ResultCache.SUFFIX):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    # Evicted by another process
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            ResultCache.__unlink(path)
+            total_size -= size
+
+
+class _DedupeIndex:
+    """Maps simulation fingerprints to the ``(pid, simid)`` of the simulation
+    that was started for them.
+
+    The index is kept in memory, or persisted under ``directory`` with one
+    file per fingerprint, so that several processes can share it.
+    """
+
+    def __init__(self, directory: Optional[Path] = None) -> None:
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._index: Dict[str, Tuple[str, str]] = {}
+        if directory is not None:
+            directory.mkdir(parents=True, exist_ok=True)
+
+    def __get_path(self, fingerprint: str) -> Path:
+        return self.directory / f"{fingerprint}.json"  # type: ignore
+
+    def get(self, fingerprint: str) -> Optional[Tuple[str, str]]:
+        if self.directory is None:
+            with self._lock:
+                return self._index.get(fingerprint)
+        try:
+            with self.__get_path(fingerprint).open(mode="r", encoding="utf-8") as f:
+                pid, simid = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return pid, simid
+
+    def put(self, fingerprint: str, pid: str, simid: str) -> None:
+        if self.directory is None:
+            with self._lock:
+                self._index[fingerprint] = (pid, simid)
+            return
+        path = self.__get_path(fingerprint)
+        # Unique per writer, so that concurrent writers do not share a file
+        tmp_path = path.with_name(
+            f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        with tmp_path.open(mode="w", encoding="utf-8") as f:
+            json.dump([pid, simid], f)
+        os.replace(tmp_path, path)
+
+    def remove(self, fingerprint: str) -> None:
+        if self.directory is None:
+            with self._lock:
+                self._index.pop(fingerprint, None)
+            return
+        try:
+            os.unlink(self.__get_path(fingerprint))
+        except OSError:
+            pass
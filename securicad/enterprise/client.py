@@ -12,12 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Any, Dict, Optional, Tuple, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 from urllib.parse import urljoin
 
 import requests
 
+from securicad.enterprise.cache import ResultCache
 from securicad.enterprise.exceptions import StatusCodeException
+from securicad.enterprise.index import _Resolver
 from securicad.enterprise.metadata import Metadata
 from securicad.enterprise.models import Models
 from securicad.enterprise.organizations import Organizations
@@ -40,6 +42,8 @@ class Client:
         backend_url: Optional[str] = None,
         cacert: Optional[Union[bool, str]] = None,
         client_cert: Optional[Union[str, Tuple[str, str]]] = None,
+        cache_dir: Optional[str] = None,
+        name_ttl: Optional[float] = None,
     ) -> None:
         self.__init_urls(base_url, backend_url)
         self.__init_session(cacert, client_cert)
@@ -54,6 +58,20 @@ class Client:
         self.metadata = Metadata(client=self)
         self.tunings = Tunings(client=self)
 
+        if cache_dir is not None:
+            self.simulations.result_cache = ResultCache(cache_dir)
+
+        if name_ttl is not None:
+            resolvers: List[_Resolver[Any, Any]] = [
+                self.organizations._name_index,
+                self.users._name_index,
+                self.projects._name_index,
+                self.scenarios._name_index,
+                self.models._name_index,
+            ]
+            for resolver in resolvers:
+                resolver.ttl = name_ttl
+
         if token:
             self._set_access_token(token)
         elif username and password:
@@ -0,0 +1,150 @@
+# Copyright 2020-2021 Foreseeti AB <https://foreseeti.com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+from typing import (
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+T = TypeVar("T")
+K = TypeVar("K", bound=Hashable)
+
+
+class _NameIndex(Generic[T]):
+    """Items indexed by key, by exact name and by casefolded name.
+
+    When several items have the same name, the first one wins, as in a linear
+    search for an exact match followed by a case-insensitive one.
+    """
+
+    def __init__(
+        self,
+        items: Iterable[T],
+        get_name: Callable[[T], str],
+        get_key: Optional[Callable[[T], Hashable]] = None,
+    ) -> None:
+        self.items: List[T] = list(items)
+        self.by_key: Dict[Hashable, T] = {}
+        self.by_name: Dict[str, T] = {}
+        self.by_casefold: Dict[str, T] = {}
+        for item in self.items:
+            if get_key is not None:
+                self.by_key[get_key(item)] = item
+            name = get_name(item)
+            self.by_name.setdefault(name, item)
+            self.by_casefold.setdefault(name.casefold(), item)
+
+    def find(self, name: str) -> Optional[T]:
+        item = self.by_name.get(name)
+        if item is None:
+            item = self.by_casefold.get(name.casefold())
+        return item
+
+
+class _IndexCache(Generic[K, T]):
+    """Keeps built indexes for ``ttl`` seconds.
+
+    An index that is invalidated while it is being built is returned to the
+    caller that built it but not stored.
+    """
+
+    def __init__(self, ttl: float) -> None:
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: Dict[K, Tuple[float, T]] = {}
+        self._generation = 0
+
+    def get(self, key: K, build: Callable[[], T]) -> T:
+        with self._lock:
+            entry = self._entries.get(key)
+            generation = self._generation
+        if entry is not None and time.monotonic() - entry[0] < self.ttl:
+            return entry[1]
+        created = time.monotonic()
+        value = build()
+        with self._lock:
+            if generation == self._generation:
+                self._entries[key] = (created, value)
+        return value
+
+    def invalidate(self, key: Optional[K] = None) -> None:
+        with self._lock:
+            self._generation += 1
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+
+class _Resolver(Generic[K, T]):
+    """Resolves items by key or name against indexes that are built with one
+    request and reused for ``ttl`` seconds.
+
+    ``list_items`` lists the items of a scope, e.g. a project id, and a lookup
+    that misses an index that may be stale rebuilds it once before giving up.
+    """
+
+    def __init__(
+        self,
+        list_items: Callable[[K], Iterable[T]],
+        get_name: Callable[[T], str],
+        get_key: Optional[Callable[[T], Hashable]] = None,
+        ttl: float = 0,
+    ) -> None:
+        self.list_items = list_items
+        self.get_name = get_name
+        self.get_key = get_key
+        self._cache: _IndexCache[K, _NameIndex[T]] = _IndexCache(ttl)
+
+    @property
+    def ttl(self) -> float:
+        return self._cache.ttl
+
+    @ttl.setter
+    def ttl(self, ttl: float) -> None:
+        self._cache.ttl = ttl
+
+    def get_index(self, scope: K, refresh: bool = False) -> _NameIndex[T]:
+        if refresh:
+            self._cache.invalidate(scope)
+        return self._cache.get(
+            scope,
+            lambda: _NameIndex(self.list_items(scope), self.get_name, self.get_key),
+        )
+
+    def invalidate(self, scope: Optional[K] = None) -> None:
+        self._cache.invalidate(scope)
+
+    def __find(
+        self, scope: K, find: Callable[[_NameIndex[T]], Optional[T]]
+    ) -> Optional[T]:
+        item = find(self.get_index(scope))
+        if item is None and self.ttl > 0:
+            item = find(self.get_index(scope, refresh=True))
+        return item
+
+    def find_by_name(self, scope: K, name: str) -> Optional[T]:
+        return self.__find(scope, lambda index: index.find(name))
+
+    def find_by_key(self, scope: K, key: Hashable) -> Optional[T]:
+        return self.__find(scope, lambda index: index.by_key.get(key))
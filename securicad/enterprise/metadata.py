@@ -12,18 +12,44 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import TYPE_CHECKING, Any, Dict, List
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set
 
 if TYPE_CHECKING:
     from securicad.enterprise.client import Client
 
 
+class _MetadataIndex:
+    def __init__(self, metadata: Dict[str, Any]) -> None:
+        self.attacksteps: Dict[str, Set[str]] = {}
+        self.all_attacksteps: Set[str] = set()
+        # Defenses can only be validated if the server includes them in metadata
+        self.defenses: Optional[Dict[str, Set[str]]] = None
+        self.all_defenses: Set[str] = set()
+        for asset, data in metadata["assets"].items():
+            attacksteps = {attackstep["name"] for attackstep in data["attacksteps"]}
+            self.attacksteps[asset] = attacksteps
+            self.all_attacksteps |= attacksteps
+            if "defenses" in data:
+                if self.defenses is None:
+                    self.defenses = {}
+                defenses = {defense["name"] for defense in data["defenses"]}
+                self.defenses[asset] = defenses
+                self.all_defenses |= defenses
+
+
 class Metadata:
     def __init__(self, client: "Client") -> None:
         self.client = client
+        self._index: Optional[_MetadataIndex] = None
+
+    def _get_index(self) -> _MetadataIndex:
+        if self._index is None:
+            self._index = _MetadataIndex(self.client._get("metadata"))
+        return self._index
 
     def get_metadata(self) -> List[Dict[str, Any]]:
         metadata = self.client._get("metadata")
+        self._index = _MetadataIndex(metadata)
         metalist = []
         for asset, data in metadata["assets"].items():
             attacksteps = []
@@ -13,12 +13,17 @@
 # limitations under the License.
 
 import base64
-import time
-from typing import TYPE_CHECKING, Any, BinaryIO, Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, BinaryIO, Dict, List, Optional, Tuple, Union
 
 from securicad.model import Model
 
+from securicad.enterprise.index import _Resolver
+from securicad.enterprise.polling import Poller
+
 if TYPE_CHECKING:
+    from concurrent.futures import Future
+
     from securicad.enterprise.client import Client
     from securicad.enterprise.projects import Project
 
@@ -34,6 +39,19 @@ def _get_is_valid(valid: int) -> Optional[bool]:
 
 
 class ModelInfo:
+    __slots__ = (
+        "client",
+        "pid",
+        "mid",
+        "name",
+        "description",
+        "_threshold",
+        "_samples",
+        "_meta_data",
+        "is_valid",
+        "validation_issues",
+    )
+
     def __init__(
         self,
         client: "Client",
@@ -41,9 +59,9 @@ class ModelInfo:
         mid: str,
         name: str,
         description: str,
-        threshold: int,
-        samples: int,
-        meta_data: Dict[str, Any],
+        threshold: Optional[int],
+        samples: Optional[int],
+        meta_data: Optional[Dict[str, Any]],
         is_valid: Optional[bool],
         validation_issues: str,
     ) -> None:
@@ -52,27 +70,70 @@ class ModelInfo:
         self.mid = mid
         self.name = name
         self.description = description
-        self.threshold = threshold
-        self.samples = samples
-        self.meta_data = meta_data
+        # threshold, samples and meta_data are fetched on first access if they
+        # are not given
+        self._threshold = threshold
+        self._samples = samples
+        self._meta_data = meta_data
         self.is_valid = is_valid
         self.validation_issues = validation_issues
 
+    def __load_model_data(self) -> None:
+        (
+            self._threshold,
+            self._samples,
+            self._meta_data,
+        ) = self.client.models._get_model_data(self.pid, self.mid)
+
+    @property
+    def threshold(self) -> int:
+        if self._threshold is None:
+            self.__load_model_data()
+        return self._threshold  # type: ignore
+
+    @threshold.setter
+    def threshold(self, threshold: int) -> None:
+        self._threshold = threshold
+
+    @property
+    def samples(self) -> int:
+        if self._samples is None:
+            self.__load_model_data()
+        return self._samples  # type: ignore
+
+    @samples.setter
+    def samples(self, samples: int) -> None:
+        self._samples = samples
+
+    @property
+    def meta_data(self) -> Dict[str, Any]:
+        if self._meta_data is None:
+            self.__load_model_data()
+        return self._meta_data  # type: ignore
+
+    @meta_data.setter
+    def meta_data(self, meta_data: Dict[str, Any]) -> None:
+        self._meta_data = meta_data
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ModelInfo):
+            return NotImplemented
+        return self.pid == other.pid and self.mid == other.mid
+
+    def __hash__(self) -> int:
+        return hash((self.pid, self.mid))
+
     @staticmethod
     def from_dict(client: "Client", dict_model: Dict[str, Any]) -> "ModelInfo":
-        threshold, samples, meta_data = client.models._get_model_data(
-            dict_model["pid"], dict_model["mid"]
-        )
-
         return ModelInfo(
             client=client,
             pid=dict_model["pid"],
             mid=dict_model["mid"],
             name=dict_model["name"],
             description=dict_model["description"],
-            threshold=threshold,
-            samples=samples,
-            meta_data=meta_data,
+            threshold=None,
+            samples=None,
+            meta_data=None,
             is_valid=_get_is_valid(dict_model["valid"]),
             validation_issues=dict_model["validation_issues"],
         )
@@ -95,14 +156,15 @@ class ModelInfo:
         if samples is not None:
             data["samples"] = samples
         dict_model = self.client._post("model", data)
-        threshold, samples, _ = self.client.models._get_model_data(self.pid, self.mid)
+        self.client.models._name_index.invalidate(self.pid)
         self.name = dict_model["name"]
         self.description = dict_model["description"]
-        self.threshold = threshold
-        self.samples = samples
+        if threshold is not None or samples is not None:
+            self._threshold = self._samples = self._meta_data = None
 
     def delete(self) -> None:
         self.client._delete("models", {"pid": self.pid, "mids": [self.mid]})
+        self.client.models._name_index.invalidate(self.pid)
 
     def lock(self) -> None:
         self.client._post("model/lock", {"mid": self.mid})
@@ -126,30 +188,53 @@ class ModelInfo:
         return Model(self.get_dict())
 
     def save(self, model: Model) -> "ModelInfo":
+        return self.save_async(model).result()
+
+    def save_async(self, model: Model) -> "Future[ModelInfo]":
+        """Saves ``model`` without waiting for the server to validate it.
+
+        :param model: The model to save.
+        :return: A :class:`concurrent.futures.Future` that resolves to the validated :class:`ModelInfo`.
+        """
         model.model["mid"] = self.mid
         model.model["name"] = self.name
         data: Dict[str, Any] = {"pid": self.pid, "model": model.model}
         self.client._post("savemodel", data)
-        return self.client.models._wait_for_model_validation(self.pid, self.mid)
+        return self.client.models._validate_async(self.pid, self.mid)
 
     # TODO: method for models/tune endpoint
 
 
+class _ModelValidationPoller(Poller):
+    def __init__(self, client: "Client") -> None:
+        super().__init__()
+        self.client = client
+
+    def _poll(self, pid: str, keys: List[str]) -> Dict[str, Any]:
+        mids = set(keys)
+        model_infos = {}
+        for dict_model in self.client.models._list_dict_models(pid):
+            if dict_model["mid"] not in mids:
+                continue
+            if _get_is_valid(dict_model["valid"]) is not None:
+                model_infos[dict_model["mid"]] = ModelInfo.from_dict(
+                    client=self.client, dict_model=dict_model
+                )
+        return model_infos
+
+
 class Models:
     def __init__(self, client: "Client") -> None:
         self.client = client
+        self._validation_poller = _ModelValidationPoller(client)
+        self._name_index: _Resolver[str, Dict[str, Any]] = _Resolver(
+            self._list_dict_models,
+            get_name=lambda m: m["name"],
+            get_key=lambda m: m["mid"],
+        )
 
-    def _wait_for_model_validation(self, pid: str, mid: str) -> ModelInfo:
-        while True:
-            for dict_model in self._list_dict_models(pid):
-                if dict_model["mid"] != mid:
-                    continue
-                if _get_is_valid(dict_model["valid"]) is not None:
-                    return ModelInfo.from_dict(
-                        client=self.client, dict_model=dict_model
-                    )
-                break
-            time.sleep(1)
+    def _validate_async(self, pid: str, mid: str) -> "Future[ModelInfo]":
+        return self._validation_poller.submit(pid, mid)
 
     def _list_dict_models(self, pid: str) -> List[Dict[str, Any]]:
         dict_models = self.client._post("models", {"pid": pid})
@@ -169,27 +254,32 @@ class Models:
         return models
 
     def get_model_by_mid(self, project: "Project", mid: str) -> ModelInfo:
-        dict_models = self._list_dict_models(project.pid)
-        for dict_model in dict_models:
-            if dict_model["mid"] == mid:
-                return ModelInfo.from_dict(client=self.client, dict_model=dict_model)
-        raise ValueError(f"Invalid model {mid}")
+        dict_model = self._name_index.find_by_key(project.pid, mid)
+        if dict_model is None:
+            raise ValueError(f"Invalid model {mid}")
+        return ModelInfo.from_dict(client=self.client, dict_model=dict_model)
 
     def get_model_by_name(self, project: "Project", name: str) -> ModelInfo:
-        dict_models = self._list_dict_models(project.pid)
-        for dict_model in dict_models:
-            if dict_model["name"] == name:
-                return ModelInfo.from_dict(client=self.client, dict_model=dict_model)
-        for dict_model in dict_models:
-            if dict_model["name"].lower() == name.lower():
-                return ModelInfo.from_dict(client=self.client, dict_model=dict_model)
-        raise ValueError(f"Invalid model {name}")
+        dict_model = self._name_index.find_by_name(project.pid, name)
+        if dict_model is None:
+            raise ValueError(f"Invalid model {name}")
+        return ModelInfo.from_dict(client=self.client, dict_model=dict_model)
 
     def save_as(self, project: "Project", model: Model, name: str) -> ModelInfo:
+        return self.save_as_async(project, model, name).result()
+
+    def save_as_async(
+        self, project: "Project", model: Model, name: str
+    ) -> "Future[ModelInfo]":
+        """Like :meth:`save_as`, but returns without waiting for model validation.
+
+        :return: A :class:`concurrent.futures.Future` that resolves to the validated :class:`ModelInfo`.
+        """
         model.model["name"] = f"{name}.sCAD"
         data: Dict[str, Any] = {"pid": project.pid, "model": model.model}
         dict_model = self.client._post("savemodelas", data)
-        return self._wait_for_model_validation(project.pid, dict_model["mid"])
+        self._name_index.invalidate(project.pid)
+        return self._validate_async(project.pid, dict_model["mid"])
 
     def upload_scad_model(
         self,
@@ -207,6 +297,82 @@ class Models:
         :return: A :class:`ModelInfo` object representing the uploaded model.
         """
 
+        return self.upload_scad_model_async(
+            project, filename, file_io, description
+        ).result()
+
+    def upload_scad_model_async(
+        self,
+        project: "Project",
+        filename: str,
+        file_io: BinaryIO,
+        description: Optional[str] = None,
+    ) -> "Future[ModelInfo]":
+        """Like :meth:`upload_scad_model`, but returns without waiting for model validation.
+
+        :return: A :class:`concurrent.futures.Future` that resolves to the validated :class:`ModelInfo`.
+        """
+        dict_model = self._put_scad_model(project.pid, filename, file_io, description)
+        return self._validate_async(project.pid, dict_model["mid"])
+
+    def upload_many(
+        self,
+        project: "Project",
+        files: List[Dict[str, Any]],
+        max_workers: int = 8,
+    ) -> List[Union[ModelInfo, Exception]]:
+        """Uploads many ``.sCAD`` model files concurrently.
+
+        The files are uploaded by up to ``max_workers`` threads, and the validation
+        of all uploaded models is awaited with a single shared poller.
+
+        :param project: The :class:`Project` to upload the models to.
+        :param files: A list of dictionaries on the format
+
+            .. code-block::
+
+                {
+                    "filename": <file-name>,
+                    "file": <binary-io>,
+                    "description": <description>,
+                }
+
+            where:
+
+            - ``<file-name>`` is the name of the model file, including the ``.sCAD`` extension
+            - ``<binary-io>`` is either a file opened in binary mode, or a :class:`io.BytesIO` object
+            - ``<description>`` is the description of the model (optional).
+        :param max_workers: (optional) The maximum number of concurrent uploads.
+        :return: A list with a :class:`ModelInfo` object for each uploaded model, in the same order as ``files``. If a file fails to upload or validate, the raised exception is returned in its place.
+        """
+
+        def upload(file_dict: Dict[str, Any]) -> "Future[ModelInfo]":
+            dict_model = self._put_scad_model(
+                project.pid,
+                file_dict["filename"],
+                file_dict["file"],
+                file_dict.get("description"),
+            )
+            return self._validate_async(project.pid, dict_model["mid"])
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            upload_futures = [executor.submit(upload, f) for f in files]
+
+        results: List[Union[ModelInfo, Exception]] = []
+        for upload_future in upload_futures:
+            try:
+                results.append(upload_future.result().result())
+            except Exception as e:  # pylint: disable=broad-except
+                results.append(e)
+        return results
+
+    def _put_scad_model(
+        self,
+        pid: str,
+        filename: str,
+        file_io: BinaryIO,
+        description: Optional[str],
+    ) -> Dict[str, Any]:
         def get_file_content(file_io: BinaryIO) -> str:
             file_bytes = file_io.read()
             file_base64 = base64.b64encode(file_bytes).decode("utf-8")
@@ -222,9 +388,10 @@ class Models:
                 _file["description"] = description
             return _file
 
-        data: Dict[str, Any] = {"pid": project.pid, "files": [[get_file()]]}
+        data: Dict[str, Any] = {"pid": pid, "files": [[get_file()]]}
         dict_model = self.client._put("models", data)[0]
-        return self._wait_for_model_validation(project.pid, dict_model["mid"])
+        self._name_index.invalidate(pid)
+        return dict_model
 
     def generate_model(
         self, project: "Project", parser: str, name: str, files: List[Dict[str, Any]]
@@ -251,6 +418,15 @@ class Models:
             - ``<binary-io>`` is either a file opened in binary mode, or a :class:`io.BytesIO` object.
         :return: A :class:`ModelInfo` object representing the generated model.
         """
+        return self.generate_model_async(project, parser, name, files).result()
+
+    def generate_model_async(
+        self, project: "Project", parser: str, name: str, files: List[Dict[str, Any]]
+    ) -> "Future[ModelInfo]":
+        """Like :meth:`generate_model`, but returns without waiting for model validation.
+
+        :return: A :class:`concurrent.futures.Future` that resolves to the validated :class:`ModelInfo`.
+        """
 
         def get_file_content(file_io: BinaryIO) -> str:
             file_bytes = file_io.read()
@@ -275,4 +451,5 @@ class Models:
             "files": get_files(),
         }
         dict_model = self.client._post(f"projects/{project.pid}/multiparser", data)
-        return self._wait_for_model_validation(project.pid, dict_model["mid"])
+        self._name_index.invalidate(project.pid)
+        return self._validate_async(project.pid, dict_model["mid"])
@@ -14,18 +14,30 @@
 
 from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
+from securicad.enterprise.index import _Resolver
+from securicad.enterprise.projects import Project
+
 if TYPE_CHECKING:
     from securicad.enterprise.client import Client
-    from securicad.enterprise.projects import Project
     from securicad.enterprise.users import User
 
 
 class Organization:
+    __slots__ = ("client", "tag", "name")
+
     def __init__(self, client: "Client", tag: str, name: str) -> None:
         self.client = client
         self.tag = tag
         self.name = name
 
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Organization):
+            return NotImplemented
+        return self.tag == other.tag
+
+    def __hash__(self) -> int:
+        return hash(self.tag)
+
     @staticmethod
     def from_dict(client: "Client", dict_org: Dict[str, Any]) -> "Organization":
         return Organization(client=client, tag=dict_org["tag"], name=dict_org["name"])
@@ -33,31 +45,46 @@ class Organization:
     def update(self, *, name: str) -> None:
         data: Dict[str, Any] = {"tag": self.tag, "name": name}
         dict_org = self.client._post("organization", data)
+        self.client.organizations._name_index.invalidate()
         self.name = dict_org["name"]
 
     def delete(self) -> None:
         self.client._delete("organization", {"tag": self.tag})
+        self.client.organizations._name_index.invalidate()
+        self.client.users._name_index.invalidate()
 
     def list_users(self) -> List["User"]:
         dict_org = self.client.organizations._get_dict_organization_by_tag(self.tag)
-        users = []
-        for dict_user in dict_org["users"]:
-            users.append(self.client.users.get_user_by_uid(dict_user["id"]))
-        return users
+        uids = [dict_user["id"] for dict_user in dict_org["users"]]
+        return self.client.users._get_users_by_uids(uids)
 
-    def list_projects(self) -> List["Project"]:
+    def list_projects(self) -> List[Project]:
         dict_org = self.client.organizations._get_dict_organization_by_tag(self.tag)
+        dict_projects = {
+            dict_project["pid"]: dict_project
+            for dict_project in self.client.projects._list_dict_projects()
+        }
         projects = []
         for dict_project in dict_org["projects"]:
-            projects.append(
-                self.client.projects.get_project_by_pid(dict_project["pid"])
-            )
+            pid = dict_project["pid"]
+            if pid in dict_projects:
+                projects.append(
+                    Project.from_dict(
+                        client=self.client, dict_project=dict_projects[pid]
+                    )
+                )
+            else:
+                # Not listed for this user, fetch it on its own
+                projects.append(self.client.projects.get_project_by_pid(pid))
         return projects
 
 
 class Organizations:
     def __init__(self, client: "Client") -> None:
         self.client = client
+        self._name_index: _Resolver[None, Dict[str, Any]] = _Resolver(
+            lambda _: self._list_dict_organizations(), get_name=lambda o: o["name"]
+        )
 
     def _list_dict_organizations(self) -> List[Dict[str, Any]]:
         dict_organizations = self.client._get("organization/all")
@@ -81,14 +108,10 @@ class Organizations:
         return Organization.from_dict(client=self.client, dict_org=dict_org)
 
     def get_organization_by_name(self, name: str) -> Organization:
-        organizations = self.list_organizations()
-        for organization in organizations:
-            if organization.name == name:
-                return organization
-        for organization in organizations:
-            if organization.name.lower() == name.lower():
-                return organization
-        raise ValueError(f"Invalid organization {name}")
+        dict_org = self._name_index.find_by_name(None, name)
+        if dict_org is None:
+            raise ValueError(f"Invalid organization {name}")
+        return Organization.from_dict(client=self.client, dict_org=dict_org)
 
     def create_organization(
         self, name: str, license: Optional[str] = None
@@ -97,4 +120,5 @@ class Organizations:
         if license is not None:
             data["license"] = license
         dict_org = self.client._put("organization", data)
+        self._name_index.invalidate()
         return Organization.from_dict(client=self.client, dict_org=dict_org)
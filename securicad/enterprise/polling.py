@@ -0,0 +1,151 @@
+# Copyright 2020-2021 Foreseeti AB <https://foreseeti.com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import abc
+import threading
+from concurrent.futures import Future, InvalidStateError
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def _set_result(future: "Future[Any]", result: Any) -> None:
+    # The caller may have cancelled its future
+    try:
+        if isinstance(result, Exception):
+            future.set_exception(result)
+        else:
+            future.set_result(result)
+    except InvalidStateError:
+        pass
+
+
+class Poller(abc.ABC):
+    """Waits for many server-side items with one background thread.
+
+    Pending items are grouped by project id. Every tick, :meth:`_poll` is
+    called once per project with the keys of all pending items in that
+    project, so the number of requests does not grow with the number of
+    waiting callers.
+
+    Every call to :meth:`submit` gets its own future. A poll only resolves the
+    futures that were submitted before it started, so a caller is never
+    resolved with a state that predates its submission.
+    """
+
+    def __init__(self, interval: float = 1) -> None:
+        self.interval = interval
+        self._lock = threading.Lock()
+        # pid -> key -> [(tick of submission, future)]
+        self._pending: Dict[str, Dict[str, List[Tuple[int, "Future[Any]"]]]] = {}
+        self._tick = 0
+        self._thread: Optional[threading.Thread] = None
+        self._wakeup = threading.Event()
+
+    def submit(self, pid: str, key: str) -> "Future[Any]":
+        future: "Future[Any]" = Future()
+        with self._lock:
+            # Items of a project that is already polled wait for its next tick
+            wakeup = pid not in self._pending
+            waiters = self._pending.setdefault(pid, {}).setdefault(key, [])
+            waiters.append((self._tick, future))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+        if wakeup:
+            self._wakeup.set()
+        return future
+
+    @abc.abstractmethod
+    def _poll(self, pid: str, keys: List[str]) -> Dict[str, Any]:
+        """Returns the results of the items in ``keys`` that are done.
+
+        A result that is an :class:`Exception` fails the waiters of that item only.
+        """
+
+    def _get_interval(self) -> float:
+        """Returns the number of seconds to wait before the next tick."""
+        return self.interval
+
+    def _on_done(self, pid: str, key: str) -> None:
+        """Called when an item is no longer pending."""
+
+    def __snapshot(self) -> Tuple[int, Dict[str, List[str]]]:
+        done = []
+        with self._lock:
+            self._tick += 1
+            for pid, keys in list(self._pending.items()):
+                for key, waiters in list(keys.items()):
+                    keys[key] = [w for w in waiters if not w[1].done()]
+                    if not keys[key]:
+                        del keys[key]
+                        done.append((pid, key))
+                if not keys:
+                    del self._pending[pid]
+            tick = self._tick
+            pending = {pid: list(keys) for pid, keys in self._pending.items()}
+        for pid, key in done:
+            self._on_done(pid, key)
+        return tick, pending
+
+    def __resolve(self, pid: str, key: str, tick: int, result: Any) -> None:
+        with self._lock:
+            keys = self._pending.get(pid, {})
+            waiters = keys.get(key, [])
+            resolved = [f for t, f in waiters if t < tick]
+            waiters = [w for w in waiters if w[0] >= tick]
+            if waiters:
+                keys[key] = waiters
+            else:
+                keys.pop(key, None)
+                if not keys:
+                    self._pending.pop(pid, None)
+        try:
+            for future in resolved:
+                _set_result(future, result)
+        finally:
+            if not waiters:
+                self._on_done(pid, key)
+
+    def _run(self) -> None:
+        try:
+            while True:
+                self._wakeup.clear()
+                tick, pending = self.__snapshot()
+                with self._lock:
+                    if not self._pending:
+                        self._thread = None
+                        return
+                for pid, keys in pending.items():
+                    try:
+                        results = self._poll(pid, keys)
+                    except Exception as e:  # pylint: disable=broad-except
+                        results = {key: e for key in keys}
+                    for key, result in results.items():
+                        self.__resolve(pid, key, tick, result)
+                # Wake up early when items of a new project are submitted
+                self._wakeup.wait(self._get_interval())
+        except BaseException as e:
+            # Fail everything rather than leaving callers waiting on a dead thread
+            with self._lock:
+                self._thread = None
+                pending_waiters = [
+                    (pid, key, waiters)
+                    for pid, keys in self._pending.items()
+                    for key, waiters in keys.items()
+                ]
+                self._pending = {}
+            for pid, key, waiters in pending_waiters:
+                for _, future in waiters:
+                    _set_result(future, RuntimeError(f"Poller failed: {e!r}"))
+                self._on_done(pid, key)
+            raise
@@ -15,6 +15,8 @@
 from enum import IntEnum, unique
 from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
+from securicad.enterprise.index import _Resolver
+
 if TYPE_CHECKING:
     from securicad.enterprise.client import Client
     from securicad.enterprise.models import ModelInfo
@@ -40,6 +42,8 @@ class AccessLevel(IntEnum):
 
 
 class Project:
+    __slots__ = ("client", "pid", "name", "description", "access_level")
+
     def __init__(
         self,
         client: "Client",
@@ -54,6 +58,14 @@ class Project:
         self.description = description
         self.access_level = access_level
 
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Project):
+            return NotImplemented
+        return self.pid == other.pid
+
+    def __hash__(self) -> int:
+        return hash(self.pid)
+
     @staticmethod
     def from_dict(client: "Client", dict_project: Dict[str, Any]) -> "Project":
         return Project(
@@ -73,18 +85,18 @@ class Project:
             "description": self.description if description is None else description,
         }
         dict_project = self.client._post("project", data)
+        self.client.projects._name_index.invalidate()
         self.name = dict_project["name"]
         self.description = dict_project["description"]
 
     def delete(self) -> None:
         self.client._delete("project", {"pid": self.pid})
+        self.client.projects._name_index.invalidate()
 
     def list_users(self) -> List["User"]:
         dict_project = self.client.projects._get_dict_project_by_pid(self.pid)
-        users = []
-        for dict_user in dict_project["users"]:
-            users.append(self.client.users.get_user_by_uid(dict_user["uid"]))
-        return users
+        uids = [dict_user["uid"] for dict_user in dict_project["users"]]
+        return self.client.users._get_users_by_uids(uids)
 
     def add_user(
         self, user: "User", access_level: Optional[AccessLevel] = None
@@ -114,21 +126,13 @@ class Project:
         self.client._post("project/user", data)
 
     def list_models(self) -> List["ModelInfo"]:
-        dict_projects = self.client.projects._list_dict_projects()
-        models = []
-        for dict_project in dict_projects:
-            if dict_project["pid"] == self.pid:
-                for dict_model in dict_project["models"]:
-                    models.append(
-                        self.client.models.get_model_by_mid(self, dict_model["mid"])
-                    )
-                break
-        return models
+        return self.client.models.list_models(self)
 
     def import_models(self, model_infos: List["ModelInfo"]) -> None:
         mids = [model_info.mid for model_info in model_infos]
         data: Dict[str, Any] = {"pid": self.pid, "mids": mids}
         self.client._post("models/import", data)
+        self.client.models._name_index.invalidate(self.pid)
 
     def list_scenarios(self) -> List["Scenario"]:
         return self.client.scenarios.list_scenarios(self)
@@ -140,6 +144,9 @@ class Project:
 class Projects:
     def __init__(self, client: "Client") -> None:
         self.client = client
+        self._name_index: _Resolver[None, Dict[str, Any]] = _Resolver(
+            lambda _: self._list_dict_projects(), get_name=lambda p: p["name"]
+        )
 
     def _list_dict_projects(self) -> List[Dict[str, Any]]:
         dict_projects = self.client._post("projects")
@@ -163,14 +170,10 @@ class Projects:
         return Project.from_dict(client=self.client, dict_project=dict_project)
 
     def get_project_by_name(self, name: str) -> Project:
-        projects = self.list_projects()
-        for project in projects:
-            if project.name == name:
-                return project
-        for project in projects:
-            if project.name.lower() == name.lower():
-                return project
-        raise ValueError(f"Invalid project {name}")
+        dict_project = self._name_index.find_by_name(None, name)
+        if dict_project is None:
+            raise ValueError(f"Invalid project {name}")
+        return Project.from_dict(client=self.client, dict_project=dict_project)
 
     def create_project(
         self,
@@ -185,4 +188,5 @@ class Projects:
         if organization is not None:
             data["organization"] = organization.tag
         dict_project = self.client._put("project", data)
+        self._name_index.invalidate()
         return self.get_project_by_pid(dict_project["pid"])
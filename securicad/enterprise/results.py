@@ -0,0 +1,379 @@
+# Copyright 2020-2021 Foreseeti AB <https://foreseeti.com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import itertools
+import json
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+if TYPE_CHECKING:
+    from securicad.enterprise.client import Client
+    from securicad.enterprise.simulations import Simulation
+
+STRING_COLUMNS = ["object_id", "object_name", "metaconcept", "attackstep"]
+NUMBER_COLUMNS = ["ttc5", "ttc50", "ttc95", "probability", "consequence"]
+EXPORT_STRING_COLUMNS = ["pid", "tid", "simid"] + STRING_COLUMNS
+
+
+def _import_numpy() -> Any:
+    try:
+        import numpy  # pylint: disable=import-outside-toplevel
+    except ImportError as e:
+        raise ImportError("ResultSet requires numpy, run: pip install numpy") from e
+    return numpy
+
+
+class SimulationResult(Mapping[str, Any]):
+    """The results of a simulation, parsed one top-level section at a time.
+
+    Sections that are loaded as raw JSON text, e.g. from a :class:`ResultCache`,
+    are only parsed the first time they are accessed, so reading the summary
+    risks of a large model does not pay for its attack paths. The object is a
+    read-only mapping; use :meth:`to_dict` for a plain dictionary.
+    """
+
+    def __init__(
+        self,
+        sections: Optional[Dict[str, Any]] = None,
+        raw_sections: Optional[Dict[str, str]] = None,
+    ) -> None:
+        self._sections: Dict[str, Any] = {} if sections is None else sections
+        self._raw_sections: Dict[str, str] = (
+            {} if raw_sections is None else raw_sections
+        )
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._sections:
+            raw = self._raw_sections.pop(key)
+            self._sections[key] = json.loads(raw)
+        return self._sections[key]
+
+    def __iter__(self) -> Iterator[str]:
+        # Parsing a section moves it between the dictionaries
+        return iter(list(self._sections) + list(self._raw_sections))
+
+    def __len__(self) -> int:
+        return len(self._sections) + len(self._raw_sections)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._sections or key in self._raw_sections
+
+    def __repr__(self) -> str:
+        return f"SimulationResult({list(self)})"
+
+    def _set(self, key: str, value: Any) -> None:
+        self._raw_sections.pop(key, None)
+        self._sections[key] = value
+
+    def _get_raw_sections(self) -> Dict[str, str]:
+        raw_sections = {k: json.dumps(v) for k, v in self._sections.items()}
+        raw_sections.update(self._raw_sections)
+        return raw_sections
+
+    def is_loaded(self, key: str) -> bool:
+        """Returns whether the section ``key`` has been parsed."""
+        return key in self._sections
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Parses all sections and returns them as a dictionary."""
+        return {key: self[key] for key in self}
+
+
+def iter_risks(result: Mapping[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Yields one flat row per high value asset in the results of a simulation.
+
+    :param result: The results of a simulation, as returned by :meth:`Simulation.get_results`.
+    """
+    for risk in result["results"]["risks"]:
+        yield {
+            "object_id": str(risk["id"]),
+            "object_name": risk["name"],
+            "metaconcept": risk["metaconcept"],
+            "attackstep": risk["attackstep"],
+            "ttc5": risk["ttc5"],
+            "ttc50": risk["ttc50"],
+            "ttc95": risk["ttc95"],
+            "probability": risk["probability"],
+            "consequence": risk["consequence"],
+        }
+
+
+TTC_COLUMNS = ["ttc5", "ttc50", "ttc95"]
+
+
+def _is_reachable(risk: Dict[str, Any]) -> bool:
+    return risk["probability"] is not None and risk["probability"] > 0
+
+
+def _get_risk(risk: Optional[Dict[str, Any]]) -> float:
+    if risk is None or risk["probability"] is None or risk["consequence"] is None:
+        return 0.0
+    return risk["probability"] * risk["consequence"]
+
+
+def diff_results(a: Mapping[str, Any], b: Mapping[str, Any]) -> Dict[str, Any]:
+    """Compares the high value assets of two simulation results.
+
+    Assets are matched on ``(object_id, attackstep)`` through a dictionary, so
+    the comparison is linear in the number of assets. An asset is reachable if
+    its probability is greater than zero, and assets missing from a result are
+    unreachable in it.
+
+    :param a: The results of the baseline simulation, as returned by :meth:`Simulation.get_results`.
+    :param b: The results of the simulation to compare with the baseline.
+    :return: A dictionary on the format
+
+        .. code-block::
+
+            {
+                "changed_ttc": [{<asset>, "ttc5": [<a>, <b>], "ttc50": [<a>, <b>], "ttc95": [<a>, <b>]}, ...],
+                "newly_reachable": [<asset>, ...],
+                "newly_unreachable": [<asset>, ...],
+                "risk": [{<asset>, "before": <a>, "after": <b>, "delta": <b - a>}, ...],
+                "total_risk_delta": <sum of deltas>,
+            }
+
+        where ``<asset>`` are the keys ``object_id``, ``object_name``, ``metaconcept`` and ``attackstep``. ``changed_ttc`` lists assets reachable in both results with a changed TTC, and ``risk`` lists assets whose risk (``probability * consequence``) changed.
+    """
+    risks_a = {(r["object_id"], r["attackstep"]): r for r in iter_risks(a)}
+    risks_b = {(r["object_id"], r["attackstep"]): r for r in iter_risks(b)}
+    diff: Dict[str, Any] = {
+        "changed_ttc": [],
+        "newly_reachable": [],
+        "newly_unreachable": [],
+        "risk": [],
+        "total_risk_delta": 0.0,
+    }
+    for key in itertools.chain(risks_a, (k for k in risks_b if k not in risks_a)):
+        risk_a = risks_a.get(key)
+        risk_b = risks_b.get(key)
+        either = risk_a if risk_a is not None else risk_b
+        assert either is not None
+        asset = {column: either[column] for column in STRING_COLUMNS}
+        reachable_a = risk_a is not None and _is_reachable(risk_a)
+        reachable_b = risk_b is not None and _is_reachable(risk_b)
+        if reachable_b and not reachable_a:
+            diff["newly_reachable"].append(asset)
+        elif reachable_a and not reachable_b:
+            diff["newly_unreachable"].append(asset)
+        elif reachable_a and risk_a is not None and risk_b is not None:
+            if any(risk_a[c] != risk_b[c] for c in TTC_COLUMNS):
+                ttcs = {c: [risk_a[c], risk_b[c]] for c in TTC_COLUMNS}
+                diff["changed_ttc"].append({**asset, **ttcs})
+        before = _get_risk(risk_a)
+        after = _get_risk(risk_b)
+        if before != after:
+            delta = after - before
+            diff["risk"].append(
+                {**asset, "before": before, "after": after, "delta": delta}
+            )
+            diff["total_risk_delta"] += delta
+    return diff
+
+
+class _NdjsonWriter:
+    def __init__(self, path: str) -> None:
+        self.file: IO[str] = open(path, mode="w", encoding="utf-8")
+
+    def write(self, rows: List[Dict[str, Any]]) -> None:
+        for row in rows:
+            self.file.write(json.dumps(row, allow_nan=False))
+            self.file.write("\n")
+
+    def close(self) -> None:
+        self.file.close()
+
+
+class _ParquetWriter:
+    def __init__(self, path: str) -> None:
+        try:
+            # pylint: disable=import-outside-toplevel
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as e:
+            raise ImportError(
+                "Parquet export requires pyarrow, run: pip install pyarrow"
+            ) from e
+        self.pyarrow = pyarrow
+        fields = [(c, pyarrow.string()) for c in EXPORT_STRING_COLUMNS]
+        fields += [(c, pyarrow.float64()) for c in NUMBER_COLUMNS]
+        self.schema = pyarrow.schema(fields)
+        self.writer = pyarrow.parquet.ParquetWriter(path, self.schema)
+
+    def write(self, rows: List[Dict[str, Any]]) -> None:
+        if rows:
+            table = self.pyarrow.Table.from_pylist(rows, schema=self.schema)
+            self.writer.write_table(table)
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+def _open_writer(path: str, format: str) -> Any:
+    if format == "ndjson":
+        return _NdjsonWriter(path)
+    if format == "parquet":
+        return _ParquetWriter(path)
+    raise ValueError(f"Invalid export format {format}")
+
+
+class ResultSet:
+    """Results of many simulations in columnar NumPy arrays.
+
+    Each row is a high value asset in one simulation. The ``simulation`` column
+    holds the index of the row's simulation in :attr:`simids`, the columns in
+    ``STRING_COLUMNS`` are object arrays, and the columns in ``NUMBER_COLUMNS``
+    and the derived ``risk`` column (``probability * consequence``) are float
+    arrays, with ``nan`` for missing values.
+    """
+
+    def __init__(self, simids: List[str], columns: Dict[str, Any]) -> None:
+        self.simids = simids
+        self.columns = columns
+
+    @staticmethod
+    def from_results(
+        simids: List[str], results: Sequence[Mapping[str, Any]]
+    ) -> "ResultSet":
+        np = _import_numpy()
+        rows: Dict[str, List[Any]] = {
+            column: [] for column in ["simulation"] + STRING_COLUMNS + NUMBER_COLUMNS
+        }
+        for i, result in enumerate(results):
+            for risk in iter_risks(result):
+                rows["simulation"].append(i)
+                for column in STRING_COLUMNS + NUMBER_COLUMNS:
+                    rows[column].append(risk[column])
+        columns = {"simulation": np.array(rows["simulation"], dtype=np.int64)}
+        for column in STRING_COLUMNS:
+            columns[column] = np.array(rows[column], dtype=object)
+        for column in NUMBER_COLUMNS:
+            values = [np.nan if v is None else v for v in rows[column]]
+            columns[column] = np.array(values, dtype=np.float64)
+        columns["risk"] = columns["probability"] * columns["consequence"]
+        return ResultSet(simids, columns)
+
+    @staticmethod
+    def from_simulations(
+        client: "Client", simulations: List["Simulation"]
+    ) -> "ResultSet":
+        """Waits for ``simulations`` and loads their results.
+
+        :param client: The client to fetch the results with.
+        :param simulations: The :class:`Simulation` objects to load.
+        """
+        results = client.simulations.wait_all(simulations, lazy=True)
+        return ResultSet.from_results([s.simid for s in simulations], results)
+
+    def __len__(self) -> int:
+        return len(self.columns["simulation"])
+
+    def __getitem__(self, column: str) -> Any:
+        return self.columns[column]
+
+    def filter(self, mask: Any = None, **equals: Any) -> "ResultSet":
+        """Returns the rows where ``mask`` is true and each given column equals its value.
+
+        Example: ``result_set.filter(result_set["ttc50"] < 10, metaconcept="S3Bucket")``
+        """
+        np = _import_numpy()
+        keep = np.ones(len(self), dtype=bool) if mask is None else np.asarray(mask)
+        for column, value in equals.items():
+            keep = keep & (self.columns[column] == value)
+        columns = {name: values[keep] for name, values in self.columns.items()}
+        return ResultSet(self.simids, columns)
+
+    def aggregate(self, column: str, func: str = "sum") -> Any:
+        """Aggregates a number column per simulation, ignoring ``nan`` values.
+
+        :param column: The name of the column.
+        :param func: (optional) One of ``"sum"``, ``"mean"``, ``"min"``, ``"max"`` or ``"count"``.
+        :return: An array with one value per simulation, aligned with :attr:`simids`.
+        """
+        np = _import_numpy()
+        values = self.columns[column]
+        valid = ~np.isnan(values)
+        simulation = self.columns["simulation"][valid]
+        values = values[valid]
+        count = np.bincount(simulation, minlength=len(self.simids))
+        if func == "count":
+            return count
+        if func in ("sum", "mean"):
+            total = np.bincount(simulation, weights=values, minlength=len(self.simids))
+            if func == "sum":
+                return total
+            with np.errstate(invalid="ignore", divide="ignore"):
+                return total / count
+        if func in ("min", "max"):
+            ufunc = np.minimum if func == "min" else np.maximum
+            out = np.full(len(self.simids), np.inf if func == "min" else -np.inf)
+            ufunc.at(out, simulation, values)
+            out[count == 0] = np.nan
+            return out
+        raise ValueError(f"Invalid aggregation {func}")
+
+    def pivot(self, column: str) -> Tuple[List[Tuple[str, str]], Any]:
+        """Arranges a number column as a matrix of assets by simulations.
+
+        :param column: The name of the column.
+        :return: A tuple ``(keys, matrix)``, where ``keys`` lists the ``(object_id, attackstep)`` of each row of ``matrix``, and the columns of ``matrix`` are aligned with :attr:`simids`. Missing values are ``nan``.
+        """
+        np = _import_numpy()
+        index: Dict[Tuple[str, str], int] = {}
+        rows = np.fromiter(
+            (
+                index.setdefault(key, len(index))
+                for key in zip(self.columns["object_id"], self.columns["attackstep"])
+            ),
+            dtype=np.int64,
+            count=len(self),
+        )
+        matrix = np.full((len(index), len(self.simids)), np.nan)
+        matrix[rows, self.columns["simulation"]] = self.columns[column]
+        return list(index), matrix
+
+    def compare(self, column: str, baseline: str) -> Tuple[List[Tuple[str, str]], Any]:
+        """Subtracts the values of a baseline simulation from all simulations.
+
+        :param column: The name of a number column.
+        :param baseline: The simid of the baseline simulation.
+        :return: A tuple ``(keys, matrix)`` as returned by :meth:`pivot`, with the baseline subtracted.
+        """
+        keys, matrix = self.pivot(column)
+        baseline_index = self.simids.index(baseline)
+        return keys, matrix - matrix[:, [baseline_index]]
+
+    def to_pandas(self) -> Any:
+        """Returns the result set as a :class:`pandas.DataFrame` with a ``simid`` column."""
+        try:
+            import pandas  # pylint: disable=import-outside-toplevel
+        except ImportError as e:
+            raise ImportError(
+                "to_pandas requires pandas, run: pip install pandas"
+            ) from e
+        np = _import_numpy()
+        data = dict(self.columns)
+        data["simid"] = np.array(self.simids, dtype=object)[self.columns["simulation"]]
+        del data["simulation"]
+        return pandas.DataFrame(data)
@@ -12,8 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
+from securicad.enterprise.index import _Resolver
 from securicad.enterprise.simulations import Simulation
 
 if TYPE_CHECKING:
@@ -24,6 +26,8 @@ if TYPE_CHECKING:
 
 
 class Scenario:
+    __slots__ = ("client", "pid", "tid", "name", "description")
+
     def __init__(
         self, client: "Client", pid: str, tid: str, name: str, description: str
     ) -> None:
@@ -33,6 +37,14 @@ class Scenario:
         self.name = name
         self.description = description
 
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Scenario):
+            return NotImplemented
+        return self.pid == other.pid and self.tid == other.tid
+
+    def __hash__(self) -> int:
+        return hash((self.pid, self.tid))
+
     @staticmethod
     def from_dict(client: "Client", dict_scenario: Dict[str, Any]) -> "Scenario":
         return Scenario(
@@ -53,19 +65,25 @@ class Scenario:
             "description": self.description if description is None else description,
         }
         response = self.client._post("scenario", data)
+        self.client.scenarios._name_index.invalidate(self.pid)
         self.name = response["name"]
         self.description = response["description"]
 
     def delete(self) -> None:
         data: Dict[str, Any] = {"pid": self.pid, "tids": [self.tid]}
         self.client._delete("scenarios", data)
+        self.client.scenarios._name_index.invalidate(self.pid)
+        self.client.simulations._scenario_index.invalidate((self.pid, self.tid))
 
     def list_simulations(self) -> List[Simulation]:
-        dict_scenario = self.client.scenarios._get_dict_scenario_by_tid(
-            self.pid, self.tid
-        )
+        """Lists the simulations of the scenario.
+
+        The simulations are indexed per scenario for a few seconds, and the index
+        is invalidated when a simulation is created or deleted through the SDK.
+        """
+        index = self.client.simulations._get_scenario_index(self.pid, self.tid)
         simulations = []
-        for dict_simulation in dict_scenario["results"].values():
+        for dict_simulation in index.items:
             simulations.append(
                 Simulation.from_dict(
                     client=self.client, dict_simulation=dict_simulation
@@ -77,6 +95,10 @@ class Scenario:
 class Scenarios:
     def __init__(self, client: "Client") -> None:
         self.client = client
+        self._name_index: _Resolver[str, Dict[str, Any]] = _Resolver(
+            lambda pid: self._list_dict_scenarios(pid).values(),
+            get_name=lambda s: s["name"],
+        )
 
     def _list_dict_scenarios(self, pid: str) -> Dict[str, Dict[str, Any]]:
         dict_scenarios = self.client._post("scenarios", {"pid": pid})
@@ -101,14 +123,10 @@ class Scenarios:
         return Scenario.from_dict(client=self.client, dict_scenario=dict_scenario)
 
     def get_scenario_by_name(self, project: "Project", name: str) -> Scenario:
-        scenarios = self.list_scenarios(project)
-        for scenario in scenarios:
-            if scenario.name == name:
-                return scenario
-        for scenario in scenarios:
-            if scenario.name.lower() == name.lower():
-                return scenario
-        raise ValueError(f"Invalid scenario {name}")
+        dict_scenario = self._name_index.find_by_name(project.pid, name)
+        if dict_scenario is None:
+            raise ValueError(f"Invalid scenario {name}")
+        return Scenario.from_dict(client=self.client, dict_scenario=dict_scenario)
 
     def create_scenario(
         self,
@@ -128,4 +146,73 @@ class Scenarios:
             "cids": [t.tuning_id for t in tunings],
         }
         dict_scenario = self.client._put("scenario", data)
+        self._name_index.invalidate(project.pid)
         return Scenario.from_dict(client=self.client, dict_scenario=dict_scenario)
+
+    def create_scenarios(
+        self,
+        project: "Project",
+        scenarios: List[Tuple["ModelInfo", str, Optional[List["Tuning"]]]],
+        max_workers: int = 8,
+        wait: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Creates many scenarios concurrently.
+
+        The scenarios are created by up to ``max_workers`` threads. Every new
+        scenario starts an initial simulation, and if ``wait`` is ``True`` the
+        initial simulations are awaited with the batched simulation poller and
+        their results are fetched.
+
+        :param project: The :class:`Project` to create the scenarios in.
+        :param scenarios: A list of ``(model_info, name, tunings)`` tuples, where ``tunings`` is a list of :class:`Tuning` objects or ``None``.
+        :param max_workers: (optional) The maximum number of scenarios to create at the same time.
+        :param wait: (optional) Whether to wait for the initial simulations.
+        :return: A list of dictionaries on the format
+
+            .. code-block::
+
+                {
+                    "scenario": <scenario>,
+                    "simulation": <simulation>,
+                    "results": <results>,
+                    "error": <exception>,
+                }
+
+            in the same order as ``scenarios``. ``<simulation>`` and ``<results>`` are only set if ``wait`` is ``True``. Values are ``None`` when a step fails, and ``<exception>`` is the exception that was raised, or ``None``.
+        """
+        rows: List[Dict[str, Any]] = [
+            {"scenario": None, "simulation": None, "results": None, "error": None}
+            for _ in scenarios
+        ]
+
+        def create(
+            row: Dict[str, Any],
+            item: Tuple["ModelInfo", str, Optional[List["Tuning"]]],
+        ) -> None:
+            model_info, name, tunings = item
+            try:
+                row["scenario"] = self.create_scenario(
+                    project, model_info, name, tunings=tunings
+                )
+                if wait:
+                    row["simulation"] = row["scenario"].list_simulations()[0]
+            except Exception as e:  # pylint: disable=broad-except
+                row["error"] = e
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for row, item in zip(rows, scenarios):
+                executor.submit(create, row, item)
+
+        pending: Dict["Future[int]", Dict[str, Any]] = {
+            row["simulation"]._wait_async(): row
+            for row in rows
+            if row["simulation"] is not None
+        }
+        for future in as_completed(pending):
+            row = pending[future]
+            try:
+                row["simulation"].progress = future.result()
+                row["results"] = row["simulation"]._fetch_results().to_dict()
+            except Exception as e:  # pylint: disable=broad-except
+                row["error"] = e
+        return rows
@@ -0,0 +1,170 @@
+# Copyright 2020-2021 Foreseeti AB <https://foreseeti.com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import functools
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from enum import IntEnum, unique
+from typing import TYPE_CHECKING, Any, Deque, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from securicad.model import Model
+
+    from securicad.enterprise.client import Client
+    from securicad.enterprise.scenarios import Scenario
+    from securicad.enterprise.simulations import Simulation
+    from securicad.enterprise.tunings import Tuning
+
+
+@unique
+class Priority(IntEnum):
+    INTERACTIVE = 0
+    NORMAL = 1
+    BATCH = 2
+
+
+class _Item:
+    __slots__ = ("scenario", "kwargs", "future")
+
+    def __init__(self, scenario: "Scenario", kwargs: Dict[str, Any]) -> None:
+        self.scenario = scenario
+        self.kwargs = kwargs
+        self.future: "Future[Simulation]" = Future()
+
+
+class SimulationScheduler:
+    """Limits the number of simulations that run on the server at the same time.
+
+    Submitted simulations are queued and created only when fewer than
+    ``max_in_flight`` simulations of the scheduler are running. Completions are
+    detected with the batched simulation poller. Queued simulations with a
+    lower :class:`Priority` are created first, and simulations with the same
+    priority are taken from each project in turn, so that a large batch in one
+    project does not hold back the others.
+
+    Simulations are created in the thread that calls :meth:`submit`, and after
+    a completion in a thread owned by the scheduler, so that creating them does
+    not delay the polling of other simulations.
+    """
+
+    def __init__(self, client: "Client", max_in_flight: int = 4) -> None:
+        self.client = client
+        self.max_in_flight = max_in_flight
+        self._lock = threading.Lock()
+        self._queues: Dict[Priority, Dict[str, Deque[_Item]]] = {
+            priority: {} for priority in Priority
+        }
+        self._in_flight = 0
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="SimulationScheduler"
+        )
+
+    def submit(
+        self,
+        scenario: "Scenario",
+        name: Optional[str] = None,
+        model: Optional["Model"] = None,
+        tunings: Optional[List["Tuning"]] = None,
+        priority: Priority = Priority.NORMAL,
+    ) -> "Future[Simulation]":
+        """Queues a simulation.
+
+        :param scenario: The :class:`Scenario` to simulate in.
+        :param name: (optional) The name of the simulation.
+        :param model: (optional) A model to simulate instead of the scenario's model.
+        :param tunings: (optional) A list of :class:`Tuning` objects to apply.
+        :param priority: (optional) The :class:`Priority` of the simulation.
+        :return: A future that is resolved with the :class:`Simulation` when it has finished or failed. Cancelling the future removes a queued simulation from the queue.
+        """
+        item = _Item(scenario, {"name": name, "model": model, "tunings": tunings})
+        with self._lock:
+            queue = self._queues[priority].setdefault(scenario.pid, deque())
+            queue.append(item)
+        self.__dispatch()
+        return item.future
+
+    def queued(self) -> int:
+        """Returns the number of simulations that have not been created yet."""
+        with self._lock:
+            return sum(
+                len(queue)
+                for queues in self._queues.values()
+                for queue in queues.values()
+            )
+
+    def in_flight(self) -> int:
+        """Returns the number of simulations that are running."""
+        with self._lock:
+            return self._in_flight
+
+    def __pop(self) -> Optional[_Item]:
+        for priority in Priority:
+            queues = self._queues[priority]
+            if not queues:
+                continue
+            # Move the project to the back to take turns between projects
+            pid = next(iter(queues))
+            queue = queues.pop(pid)
+            item = queue.popleft()
+            if queue:
+                queues[pid] = queue
+            return item
+        return None
+
+    def __dispatch(self) -> None:
+        while True:
+            with self._lock:
+                if self._in_flight >= self.max_in_flight:
+                    return
+                item = self.__pop()
+                if item is None:
+                    return
+                if not item.future.set_running_or_notify_cancel():
+                    continue
+                self._in_flight += 1
+            try:
+                simulation = self.client.simulations.create_simulation(
+                    item.scenario, **item.kwargs
+                )
+            except Exception as e:  # pylint: disable=broad-except
+                self.__fail(item, e)
+                continue
+            simulation._wait_async().add_done_callback(
+                functools.partial(self.__on_done, item, simulation)
+            )
+
+    def __on_done(
+        self, item: _Item, simulation: "Simulation", future: "Future[int]"
+    ) -> None:
+        try:
+            simulation.progress = future.result()
+        except Exception as e:  # pylint: disable=broad-except
+            self.__fail(item, e)
+        else:
+            self.__finish(item, simulation)
+        # Called from the poller thread, which must not wait for new simulations
+        self._executor.submit(self.__dispatch)
+
+    def __release(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    def __finish(self, item: _Item, simulation: "Simulation") -> None:
+        self.__release()
+        item.future.set_result(simulation)
+
+    def __fail(self, item: _Item, exception: Exception) -> None:
+        self.__release()
+        item.future.set_exception(exception)
@@ -12,28 +12,113 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
+import hashlib
+import itertools
+import json
+import logging
+import queue
 import time
-from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+    overload,
+)
 from urllib.parse import urljoin
 
+from securicad.enterprise.cache import _DedupeIndex
+from securicad.enterprise.exceptions import StatusCodeException
+from securicad.enterprise.index import _IndexCache, _NameIndex
+from securicad.enterprise.polling import Poller
+from securicad.enterprise.results import (
+    SimulationResult,
+    _open_writer,
+    diff_results,
+    iter_risks,
+)
+
 if TYPE_CHECKING:
+    from typing import Literal
+
     from securicad.model import Model
 
+    from securicad.enterprise.cache import ResultCache
     from securicad.enterprise.client import Client
     from securicad.enterprise.scenarios import Scenario
     from securicad.enterprise.tunings import Tuning
 
 
 class Simulation:
+    __slots__ = ("client", "pid", "tid", "simid", "_name", "_progress")
+
     def __init__(
-        self, client: "Client", pid: str, tid: str, simid: str, name: str, progress: int
+        self,
+        client: "Client",
+        pid: str,
+        tid: str,
+        simid: str,
+        name: Optional[str] = None,
+        progress: Optional[int] = None,
     ) -> None:
         self.client = client
         self.pid = pid
         self.tid = tid
         self.simid = simid
-        self.name = name
-        self.progress = progress
+        # name and progress are fetched on first access if they are not given
+        self._name = name
+        self._progress = progress
+
+    def __hydrate(self) -> None:
+        dict_simulation = self.client.simulations._get_dict_simulation_by_simid(
+            self.pid, self.simid
+        )
+        self._name = dict_simulation["name"]
+        self._progress = dict_simulation["progress"]
+
+    @property
+    def name(self) -> str:
+        if self._name is None:
+            self.__hydrate()
+        return self._name  # type: ignore
+
+    @name.setter
+    def name(self, name: str) -> None:
+        self._name = name
+
+    @property
+    def progress(self) -> int:
+        if self._progress is None:
+            self.__hydrate()
+        return self._progress  # type: ignore
+
+    @progress.setter
+    def progress(self, progress: int) -> None:
+        self._progress = progress
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Simulation):
+            return NotImplemented
+        return self.pid == other.pid and self.simid == other.simid
+
+    def __hash__(self) -> int:
+        return hash((self.pid, self.simid))
 
     @staticmethod
     def from_dict(client: "Client", dict_simulation: Dict[str, Any]) -> "Simulation":
@@ -46,61 +131,607 @@ class Simulation:
             progress=dict_simulation["progress"],
         )
 
-    def __update_progress(self) -> None:
-        dict_simulation = self.client.simulations._get_dict_simulation_by_simid(
-            self.pid, self.simid
-        )
-        self.progress = dict_simulation["progress"]
+    def _wait_async(self) -> "Future[int]":
+        return self.client.simulations._poller.submit_simulation(self)
 
     def __wait_for_results(self) -> None:
-        if self.progress == 100:
+        if self._progress == 100:
             return
-        while True:
-            self.__update_progress()
-            if self.progress < 0 or self.progress == 100:  # failed or finished
-                break
-            time.sleep(1)
+        self.progress = self._wait_async().result()
+
+    def watch(self) -> Iterator[int]:
+        """Yields the progress of the simulation every time it changes.
+
+        The iteration stops when the simulation is finished (100) or has failed
+        (negative progress).
+        """
+        progresses: "queue.Queue[Optional[int]]" = queue.Queue()
+        future = self.watch_callback(lambda _, progress: progresses.put(progress))
+        future.add_done_callback(lambda _: progresses.put(None))
+        try:
+            while True:
+                progress = progresses.get()
+                if progress is None:
+                    break
+                yield progress
+            future.result()
+        finally:
+            # Stop polling if the caller stops iterating early
+            future.cancel()
+
+    async def awatch(self) -> AsyncIterator[int]:
+        """Like :meth:`watch`, but as an asynchronous generator."""
+        loop = asyncio.get_running_loop()
+        progresses: "asyncio.Queue[Optional[int]]" = asyncio.Queue()
+
+        def put(progress: Optional[int]) -> None:
+            loop.call_soon_threadsafe(progresses.put_nowait, progress)
+
+        future = self.watch_callback(lambda _, progress: put(progress))
+        future.add_done_callback(lambda _: put(None))
+        try:
+            while True:
+                progress = await progresses.get()
+                if progress is None:
+                    break
+                yield progress
+            future.result()
+        finally:
+            future.cancel()
+
+    def watch_callback(
+        self, callback: Callable[["Simulation", int], None]
+    ) -> "Future[int]":
+        """Calls ``callback`` with the simulation and its progress every time the progress changes.
+
+        The callback is called from a background thread.
+
+        :param callback: The function to call.
+        :return: A :class:`concurrent.futures.Future` that resolves to the final progress.
+        """
+        last_progress: List[Optional[int]] = [None]
+
+        def listener(progress: int) -> None:
+            self.progress = progress
+            if progress != last_progress[0]:
+                last_progress[0] = progress
+                callback(self, progress)
+
+        if self._progress == 100:
+            future: "Future[int]" = Future()
+            listener(self._progress)
+            future.set_result(self._progress)
+            return future
+        return self.client.simulations._poller.watch(self, listener)
 
     def delete(self) -> None:
         data: Dict[str, Any] = {"pid": self.pid, "simids": [self.simid]}
         self.client._delete("simulations", data)
+        self.client.simulations._scenario_index.invalidate((self.pid, self.tid))
+
+    @overload
+    def get_results(self, lazy: "Literal[False]" = ...) -> Dict[str, Any]:
+        ...
+
+    @overload
+    def get_results(self, lazy: "Literal[True]") -> SimulationResult:
+        ...
+
+    def get_results(
+        self, lazy: bool = False
+    ) -> Union[Dict[str, Any], SimulationResult]:
+        """Waits for the simulation to finish and returns its results.
+
+        :param lazy: (optional) Whether to return a read-only :class:`SimulationResult` mapping instead of a dictionary. Its sections are parsed on first access when they are served from :attr:`Simulations.result_cache`.
+        """
+        cache = self.client.simulations.result_cache
+        server = self.client._base_url
+        if cache is None or not cache.contains(server, self.pid, self.simid):
+            self.__wait_for_results()
+        result = self._fetch_results()
+        return result if lazy else result.to_dict()
 
-    def get_results(self) -> Dict[str, Any]:
-        self.__wait_for_results()
-        data: Dict[str, Any] = {"pid": self.pid, "simid": self.simid}
-        result = self.client._post("simulation/data", data)
-        result["report_url"] = urljoin(
-            self.client._base_url,
-            f"project/{self.pid}/scenario/{self.tid}/report/{self.simid}",
+    def _fetch_results(self) -> SimulationResult:
+        cache = self.client.simulations.result_cache
+        server = self.client._base_url
+        result = None if cache is None else cache.get(server, self.pid, self.simid)
+        if result is None:
+            data: Dict[str, Any] = {"pid": self.pid, "simid": self.simid}
+            result = SimulationResult(self.client._post("simulation/data", data))
+            if cache is not None and self._progress == 100:
+                cache.put(server, self.pid, self.simid, result)
+        result._set(
+            "report_url",
+            urljoin(
+                self.client._base_url,
+                f"project/{self.pid}/scenario/{self.tid}/report/{self.simid}",
+            ),
         )
         return result
 
 
+class _Estimate:
+    __slots__ = ("tid", "first", "last", "delay", "next_poll")
+
+    def __init__(self, tid: str) -> None:
+        self.tid = tid
+        self.first: Optional[Tuple[float, int]] = None
+        self.last: Optional[Tuple[float, int]] = None
+        self.delay = 0.0
+        self.next_poll = 0.0
+
+    def get_rate(self) -> Optional[float]:
+        """Returns the observed progress per second, if the progress has advanced."""
+        if self.first is None or self.last is None or self.last[1] <= self.first[1]:
+            return None
+        return (self.last[1] - self.first[1]) / (self.last[0] - self.first[0])
+
+
+class _SimulationPoller(Poller):
+    """Polls simulation progress sparsely early on and densely near completion.
+
+    The completion time of each simulation is estimated from how fast its
+    progress has advanced, or from the rate of earlier simulations in the same
+    scenario until its own progress has advanced. A simulation is polled again
+    after half of its estimated remaining time, clamped to
+    [``min_interval``, ``max_interval``]. Without an estimate, the delay doubles
+    after every poll. A project is polled when the first of its simulations is
+    due, and the request includes all of its pending simulations.
+    """
+
+    def __init__(
+        self, client: "Client", min_interval: float = 0.5, max_interval: float = 30
+    ) -> None:
+        super().__init__(interval=min_interval)
+        self.client = client
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self._listeners: Dict[Tuple[str, str], List[Callable[[int], None]]] = {}
+        self._estimates: Dict[Tuple[str, str], _Estimate] = {}
+        self._rates: Dict[str, float] = {}
+
+    def submit_simulation(self, simulation: "Simulation") -> "Future[int]":
+        key = (simulation.pid, simulation.simid)
+        with self._lock:
+            if key not in self._estimates:
+                self._estimates[key] = _Estimate(simulation.tid)
+        return self.submit(simulation.pid, simulation.simid)
+
+    def watch(
+        self, simulation: "Simulation", listener: Callable[[int], None]
+    ) -> "Future[int]":
+        key = (simulation.pid, simulation.simid)
+        with self._lock:
+            self._listeners.setdefault(key, []).append(listener)
+
+        def remove_listener(_: "Future[int]") -> None:
+            with self._lock:
+                listeners = self._listeners.get(key, [])
+                listeners.remove(listener)
+                if not listeners:
+                    del self._listeners[key]
+
+        future = self.submit_simulation(simulation)
+        future.add_done_callback(remove_listener)
+        return future
+
+    def _notify(self, pid: str, simid: str, progress: int) -> None:
+        with self._lock:
+            listeners = list(self._listeners.get((pid, simid), []))
+        for listener in listeners:
+            try:
+                listener(progress)
+            except Exception:  # pylint: disable=broad-except
+                logging.getLogger(__name__).exception("Progress listener failed")
+
+    def _update_estimate(self, estimate: _Estimate, now: float, progress: int) -> None:
+        if estimate.first is None:
+            estimate.first = (now, progress)
+        estimate.last = (now, progress)
+        rate = estimate.get_rate()
+        if rate is None:
+            rate = self._rates.get(estimate.tid)
+        if rate is None:
+            delay = 2 * estimate.delay
+        else:
+            delay = (100 - progress) / rate / 2
+        estimate.delay = min(max(delay, self.min_interval), self.max_interval)
+        estimate.next_poll = now + estimate.delay
+
+    def _poll(self, pid: str, keys: List[str]) -> Dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            estimates = {
+                simid: self._estimates.setdefault((pid, simid), _Estimate(""))
+                for simid in keys
+            }
+        # The estimates only decide when to poll the project, and then all of its
+        # simulations are polled, since the request costs the same
+        if all(estimate.next_poll > now for estimate in estimates.values()):
+            return {}
+        data: Dict[str, Any] = {"pid": pid, "simids": keys}
+        try:
+            dict_simulations = self.client._post("simulations/data", data)
+        except Exception:  # pylint: disable=broad-except
+            # Poll one at a time, so that an error only fails its own simulation
+            get_dict_simulation = self.client.simulations._get_dict_simulation_by_simid
+            dict_simulations = {}
+            for simid in keys:
+                try:
+                    dict_simulations[simid] = get_dict_simulation(pid, simid)
+                except Exception as e:  # pylint: disable=broad-except
+                    dict_simulations[simid] = e
+        progresses: Dict[str, Any] = {}
+        for simid in keys:
+            dict_simulation = dict_simulations.get(simid)
+            if dict_simulation is None:
+                dict_simulation = ValueError(f"Invalid simulation {simid}")
+            if isinstance(dict_simulation, Exception):
+                progresses[simid] = dict_simulation
+                continue
+            progress = dict_simulation["progress"]
+            estimate = estimates[simid]
+            self._update_estimate(estimate, now, progress)
+            self._notify(pid, simid, progress)
+            if progress < 0 or progress == 100:  # failed or finished
+                progresses[simid] = progress
+                rate = estimate.get_rate()
+                if rate is not None and estimate.tid:
+                    with self._lock:
+                        self._rates[estimate.tid] = rate
+        return progresses
+
+    def _on_done(self, pid: str, key: str) -> None:
+        with self._lock:
+            # The simulation may have been submitted again since
+            if key not in self._pending.get(pid, {}):
+                self._estimates.pop((pid, key), None)
+
+    def _get_interval(self) -> float:
+        # Only pending simulations count, or a stale estimate would keep the
+        # interval at zero
+        with self._lock:
+            next_polls = [
+                self._estimates[(pid, simid)].next_poll
+                if (pid, simid) in self._estimates
+                else 0.0
+                for pid, keys in self._pending.items()
+                for simid in keys
+            ]
+        if not next_polls:
+            return self.interval
+        interval = min(next_polls) - time.monotonic()
+        return min(max(interval, 0), self.max_interval)
+
+
 class Simulations:
     def __init__(self, client: "Client") -> None:
         self.client = client
+        self.result_cache: Optional[ResultCache] = None
+        self._poller = _SimulationPoller(client)
+        self._dedupe_index = _DedupeIndex()
+        # Simulations of each scenario by (pid, tid), reused for a few seconds
+        self._scenario_index: _IndexCache[
+            Tuple[str, str], _NameIndex[Dict[str, Any]]
+        ] = _IndexCache(ttl=5)
+
+    def _get_scenario_index(self, pid: str, tid: str) -> _NameIndex[Dict[str, Any]]:
+        def build() -> _NameIndex[Dict[str, Any]]:
+            dict_scenario = self.client.scenarios._get_dict_scenario_by_tid(pid, tid)
+            return _NameIndex(
+                dict_scenario["results"].values(),
+                get_name=lambda s: s["name"],
+                get_key=lambda s: s["mid"],
+            )
+
+        return self._scenario_index.get((pid, tid), build)
+
+    def _get_dedupe_index(self) -> _DedupeIndex:
+        # Persist the index next to the cached results when there is a cache
+        directory = None
+        if self.result_cache is not None:
+            directory = self.result_cache.directory / "simulations"
+        if self._dedupe_index.directory != directory:
+            self._dedupe_index = _DedupeIndex(directory)
+        return self._dedupe_index
+
+    def _get_fingerprint(
+        self, scenario: "Scenario", model: Optional["Model"], tunings: List["Tuning"]
+    ) -> str:
+        # Without a blob the scenario's own model, and thereby its samples and
+        # threshold, is identified by the tid. The index may be shared between
+        # servers, where the same ids are different simulations.
+        data: Dict[str, Any] = {
+            "server": self.client._base_url,
+            "pid": scenario.pid,
+            "tid": scenario.tid,
+            "blob": None if model is None else model.model,
+            "cids": sorted(t.tuning_id for t in tunings),
+        }
+        encoded = json.dumps(data, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def __find_duplicate(self, fingerprint: str) -> Optional[Simulation]:
+        index = self._get_dedupe_index()
+        entry = index.get(fingerprint)
+        if entry is None:
+            return None
+        pid, simid = entry
+        try:
+            dict_simulation = self._get_dict_simulation_by_simid(pid, simid)
+        except (StatusCodeException, KeyError):
+            index.remove(fingerprint)
+            return None
+        if dict_simulation["progress"] < 0:
+            index.remove(fingerprint)
+            return None
+        # A running simulation is reused too, so that concurrent callers share it
+        return Simulation.from_dict(client=self.client, dict_simulation=dict_simulation)
 
     def _get_dict_simulation_by_simid(self, pid: str, simid: str) -> Dict[str, Any]:
         data: Dict[str, Any] = {"pid": pid, "simids": [simid]}
         dict_simulation = self.client._post("simulations/data", data)[simid]
         return dict_simulation
 
+    @overload
+    def wait_all(
+        self,
+        simulations: List[Simulation],
+        timeout: Optional[float] = None,
+        lazy: "Literal[False]" = ...,
+    ) -> List[Dict[str, Any]]:
+        ...
+
+    @overload
+    def wait_all(
+        self,
+        simulations: List[Simulation],
+        timeout: Optional[float] = None,
+        *,
+        lazy: "Literal[True]",
+    ) -> List[SimulationResult]:
+        ...
+
+    def wait_all(
+        self,
+        simulations: List[Simulation],
+        timeout: Optional[float] = None,
+        lazy: bool = False,
+    ) -> Union[List[Dict[str, Any]], List[SimulationResult]]:
+        """Waits for many simulations and returns their results.
+
+        The progress of all pending simulations in a project is polled with a
+        single request per tick, and the results of each simulation are fetched as
+        soon as it completes.
+
+        :param simulations: The :class:`Simulation` objects to wait for.
+        :param timeout: (optional) The maximum number of seconds to wait.
+        :param lazy: (optional) Whether to return :class:`SimulationResult` mappings instead of dictionaries, as :meth:`Simulation.get_results`.
+        :return: A list with the results of each simulation, in the same order as ``simulations``.
+        :raises concurrent.futures.TimeoutError: If the simulations are not done within ``timeout`` seconds.
+        """
+        results: List[SimulationResult] = [SimulationResult() for _ in simulations]
+        pending: Dict["Future[int]", List[int]] = {}
+        for i, simulation in enumerate(simulations):
+            if simulation._progress == 100:
+                results[i] = simulation._fetch_results()
+            else:
+                pending.setdefault(simulation._wait_async(), []).append(i)
+        try:
+            for future in as_completed(pending, timeout=timeout):
+                for i in pending[future]:
+                    simulations[i].progress = future.result()
+                    results[i] = simulations[i]._fetch_results()
+        finally:
+            # Stop polling the simulations that are no longer waited for
+            for future in pending:
+                future.cancel()
+        if lazy:
+            return results
+        return [result.to_dict() for result in results]
+
+    def sweep(
+        self,
+        scenario: "Scenario",
+        tunings: Optional[Dict[str, List["Tuning"]]] = None,
+        models: Optional[Dict[str, Optional["Model"]]] = None,
+        max_in_flight: int = 4,
+    ) -> List[Dict[str, Any]]:
+        """Runs a simulation for every combination of tunings and model variants.
+
+        At most ``max_in_flight`` simulations of the sweep run at the same time. A
+        new simulation is created as soon as a running one completes, which is
+        detected with the batched simulation poller.
+
+        :param scenario: The :class:`Scenario` to run the simulations in.
+        :param tunings: (optional) A dictionary from a label to a list of :class:`Tuning` objects to apply.
+        :param models: (optional) A dictionary from a label to a modified model to simulate, or ``None`` for the model of the scenario.
+        :param max_in_flight: (optional) The maximum number of simulations to run at the same time.
+        :return: A list of dictionaries on the format
+
+            .. code-block::
+
+                {
+                    "tunings": <tunings-label>,
+                    "model": <model-label>,
+                    "simulation": <simulation>,
+                    "results": <results>,
+                    "error": <exception>,
+                }
+
+            with one dictionary per combination. ``<simulation>`` and ``<results>`` are ``None`` if the simulation could not be created or its results not fetched, and ``<exception>`` is the exception that was raised, or ``None``.
+        """
+        tunings_grid: Dict[str, List["Tuning"]] = (
+            {"": []} if tunings is None else tunings
+        )
+        models_grid: Dict[str, Optional["Model"]] = (
+            {"": None} if models is None else models
+        )
+        rows: List[Dict[str, Any]] = [
+            {
+                "tunings": tunings_label,
+                "model": model_label,
+                "simulation": None,
+                "results": None,
+                "error": None,
+            }
+            for tunings_label, model_label in itertools.product(
+                tunings_grid, models_grid
+            )
+        ]
+
+        def start(row: Dict[str, Any]) -> Optional["Future[int]"]:
+            try:
+                simulation = self.create_simulation(
+                    scenario,
+                    name=f"Sweep tunings={row['tunings']} model={row['model']}",
+                    model=models_grid[row["model"]],
+                    tunings=tunings_grid[row["tunings"]],
+                )
+            except Exception as e:  # pylint: disable=broad-except
+                row["error"] = e
+                return None
+            row["simulation"] = simulation
+            return simulation._wait_async()
+
+        def finish(row: Dict[str, Any], future: "Future[int]") -> None:
+            simulation = row["simulation"]
+            try:
+                simulation.progress = future.result()
+                row["results"] = simulation._fetch_results().to_dict()
+            except Exception as e:  # pylint: disable=broad-except
+                row["error"] = e
+
+        queued = iter(rows)
+        in_flight: Dict["Future[int]", Dict[str, Any]] = {}
+        while True:
+            for row in queued:
+                future = start(row)
+                if future is not None:
+                    in_flight[future] = row
+                if len(in_flight) >= max_in_flight:
+                    break
+            if not in_flight:
+                return rows
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                finish(in_flight.pop(future), future)
+
+    def diff_all(
+        self, pairs: List[Tuple[Simulation, Simulation]], max_workers: int = 4
+    ) -> List[Dict[str, Any]]:
+        """Compares the results of many pairs of simulations.
+
+        The results of each distinct simulation are fetched once, by up to
+        ``max_workers`` threads, and the pairs are compared with
+        :func:`securicad.enterprise.results.diff_results`.
+
+        :param pairs: A list of ``(baseline, simulation)`` tuples of :class:`Simulation` objects.
+        :param max_workers: (optional) The maximum number of results to fetch at the same time.
+        :return: A list with the difference of each pair, in the same order as ``pairs``.
+        """
+        simulations = list(dict.fromkeys(s for pair in pairs for s in pair))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = dict(
+                zip(
+                    simulations,
+                    executor.map(lambda s: s.get_results(lazy=True), simulations),
+                )
+            )
+        return [diff_results(results[a], results[b]) for a, b in pairs]
+
+    def export(
+        self,
+        simulations: Iterable[Simulation],
+        path: str,
+        format: str = "ndjson",  # pylint: disable=redefined-builtin
+        max_workers: int = 4,
+    ) -> Dict[str, Any]:
+        """Writes the results of many simulations to a file, one row per high value asset.
+
+        Results are fetched by up to ``max_workers`` threads and written as soon as
+        they arrive, so only a bounded number of results is held in memory. Rows
+        are not written in the order of ``simulations``. A simulation whose
+        results cannot be fetched is skipped and reported instead of aborting the
+        export.
+
+        :param simulations: The :class:`Simulation` objects to export, e.g. a generator.
+        :param path: The path of the output file.
+        :param format: (optional) ``"ndjson"`` for newline-delimited JSON, or ``"parquet"``, which requires pyarrow.
+        :param max_workers: (optional) The maximum number of concurrent result downloads.
+        :return: A dictionary on the format
+
+            .. code-block::
+
+                {
+                    "rows": <number of written rows>,
+                    "errors": [{"simulation": <simulation>, "error": <exception>}, ...],
+                }
+
+            where ``errors`` lists the skipped simulations and the exceptions that were raised.
+        """
+
+        def get_rows(simulation: Simulation) -> List[Dict[str, Any]]:
+            ids = {
+                "pid": simulation.pid,
+                "tid": simulation.tid,
+                "simid": simulation.simid,
+            }
+            return [
+                {**ids, **risk}
+                for risk in iter_risks(simulation.get_results(lazy=True))
+            ]
+
+        report: Dict[str, Any] = {"rows": 0, "errors": []}
+
+        def write(
+            future: "Future[List[Dict[str, Any]]]", simulation: Simulation
+        ) -> None:
+            try:
+                rows = future.result()
+            except Exception as e:  # pylint: disable=broad-except
+                report["errors"].append({"simulation": simulation, "error": e})
+                return
+            writer.write(rows)
+            report["rows"] += len(rows)
+
+        writer = _open_writer(path, format)
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                pending: Dict["Future[List[Dict[str, Any]]]", Simulation] = {}
+                for simulation in simulations:
+                    if len(pending) >= 2 * max_workers:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            write(future, pending.pop(future))
+                    pending[executor.submit(get_rows, simulation)] = simulation
+                for future in as_completed(pending):
+                    write(future, pending[future])
+        finally:
+            writer.close()
+        return report
+
     def list_simulations(self, scenario: "Scenario") -> List[Simulation]:
         return scenario.list_simulations()
 
     def get_simulation_by_simid(self, scenario: "Scenario", simid: str) -> Simulation:
-        dict_simulation = self._get_dict_simulation_by_simid(scenario.pid, simid)
+        index = self._get_scenario_index(scenario.pid, scenario.tid)
+        dict_simulation = index.by_key.get(simid)
+        if dict_simulation is None:
+            dict_simulation = self._get_dict_simulation_by_simid(scenario.pid, simid)
         return Simulation.from_dict(client=self.client, dict_simulation=dict_simulation)
 
     def get_simulation_by_name(self, scenario: "Scenario", name: str) -> Simulation:
-        simulations = scenario.list_simulations()
-        for simulation in simulations:
-            if simulation.name == name:
-                return simulation
-        for simulation in simulations:
-            if simulation.name.lower() == name.lower():
-                return simulation
-        raise ValueError(f"Invalid simulation {name}")
+        index = self._get_scenario_index(scenario.pid, scenario.tid)
+        dict_simulation = index.find(name)
+        if dict_simulation is None:
+            # The simulation may have been created after the index was built
+            self._scenario_index.invalidate((scenario.pid, scenario.tid))
+            index = self._get_scenario_index(scenario.pid, scenario.tid)
+            dict_simulation = index.find(name)
+        if dict_simulation is None:
+            raise ValueError(f"Invalid simulation {name}")
+        return Simulation.from_dict(client=self.client, dict_simulation=dict_simulation)
 
     def create_simulation(
         self,
@@ -108,9 +739,25 @@ class Simulations:
         name: Optional[str] = None,
         model: Optional["Model"] = None,
         tunings: Optional[List["Tuning"]] = None,
+        dedupe: bool = False,
     ) -> Simulation:
+        """Creates a simulation in a scenario.
+
+        :param scenario: The :class:`Scenario` to simulate in.
+        :param name: (optional) The name of the simulation.
+        :param model: (optional) A model to simulate instead of the scenario's model.
+        :param tunings: (optional) A list of :class:`Tuning` objects to apply.
+        :param dedupe: (optional) If ``True``, returns a completed or running simulation that was previously created with the same model and tunings instead of starting a new one. The index of such simulations is kept in memory, or next to the cached results if :attr:`result_cache` is set.
+        :return: The created or reused :class:`Simulation`.
+        """
         if tunings is None:
             tunings = []
+        fingerprint = None
+        if dedupe:
+            fingerprint = self._get_fingerprint(scenario, model, tunings)
+            simulation = self.__find_duplicate(fingerprint)
+            if simulation is not None:
+                return simulation
         data: Dict[str, Any] = {"pid": scenario.pid, "tid": scenario.tid}
         if name is not None:
             data["name"] = name
@@ -118,4 +765,13 @@ class Simulations:
             data["blob"] = model.model
         data["cids"] = [t.tuning_id for t in tunings]
         response = self.client._put("simulation", data)
-        return self.get_simulation_by_simid(scenario, response["simid"])
+        self._scenario_index.invalidate((scenario.pid, scenario.tid))
+        if fingerprint is not None:
+            self._get_dedupe_index().put(fingerprint, scenario.pid, response["simid"])
+        return Simulation(
+            client=self.client,
+            pid=scenario.pid,
+            tid=scenario.tid,
+            simid=response["simid"],
+            name=name,
+        )
@@ -12,7 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import TYPE_CHECKING, Any, BinaryIO, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, BinaryIO, Dict, List, Optional, Tuple
 
 if TYPE_CHECKING:
     from securicad.enterprise.client import Client
@@ -21,6 +21,24 @@ if TYPE_CHECKING:
 
 
 class Tuning:
+    __slots__ = (
+        "client",
+        "project",
+        "tuning_id",
+        "id_",
+        "attackstep",
+        "scope",
+        "ttc",
+        "condition",
+        "consequence",
+        "defense",
+        "probability",
+        "class_",
+        "name",
+        "tag",
+        "value",
+    )
+
     def __init__(
         self,
         client: "Client",
@@ -58,6 +76,16 @@ class Tuning:
         self.tag = tag
         self.value = value
 
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Tuning):
+            return NotImplemented
+        return (
+            self.project.pid == other.project.pid and self.tuning_id == other.tuning_id
+        )
+
+    def __hash__(self) -> int:
+        return hash((self.project.pid, self.tuning_id))
+
     @staticmethod
     def from_dict(
         client: "Client", project: "Project", dict_tuning: Dict[str, Any]
@@ -112,15 +140,86 @@ class Tuning:
         )
 
 
+TUNING_TYPES = ["attacker", "ttc", "tag", "probability", "consequence"]
+
+
+def _check_tuning_type(tuning_type: str) -> None:
+    if tuning_type not in TUNING_TYPES:
+        raise ValueError(f"Unknown {tuning_type=}")
+
+
+_CONFIG_KEYS = [
+    "scope",
+    "id",
+    "attackstep",
+    "class",
+    "name",
+    "consequence",
+    "defense",
+    "probability",
+    "ttc",
+    "tag",
+    "value",
+]
+
+
+def _canonical_config(config: Dict[str, Any]) -> Tuple[Optional[str], ...]:
+    # Converted and listed configs disagree on e.g. "" and None, or 2 and "2"
+    def canonical(value: Any) -> Optional[str]:
+        if value is None or value == "":
+            return None
+        return str(value)
+
+    condition = config.get("condition") or {}
+    return tuple(canonical(config.get(key)) for key in _CONFIG_KEYS) + (
+        canonical(condition.get("tag")),
+        canonical(condition.get("value")),
+    )
+
+
+class _ObjectIndex:
+    def __init__(self, model: "Model") -> None:
+        self.by_name: Dict[str, List[Dict[str, Any]]] = {}
+        self.by_metaconcept: Dict[Tuple[str, Optional[str]], List[Dict[str, Any]]] = {}
+        for objdata in model.model["objects"].values():
+            self.by_name.setdefault(objdata["name"], []).append(objdata)
+            key = (objdata["name"], objdata["metaconcept"])
+            self.by_metaconcept.setdefault(key, []).append(objdata)
+
+    def find_object(self, name: str, metaconcept: Optional[str]) -> Any:
+        matching_names = self.by_name.get(name, [])
+        if not matching_names:
+            raise ValueError(f"Object with name '{name}' not found")
+        if len(matching_names) == 1:
+            return matching_names[0]["eid"]
+
+        # we have several matching, match metaconcept
+        matching_meta = self.by_metaconcept.get((name, metaconcept), [])
+        if not matching_meta:
+            raise ValueError(
+                f"Several objects with matching name '{name}' found, but none of the supplied type '{metaconcept}'"
+            )
+        if len(matching_meta) == 1:
+            return matching_meta[0]["eid"]
+        raise ValueError(
+            f"Several objects with matching name '{name}' found of the supplied type '{metaconcept}'"
+        )
+
+
 class Tunings:
     def __init__(self, client: "Client") -> None:
         self.client = client
 
+    def _list_dict_tunings(self, pid: str) -> Dict[str, Dict[str, Any]]:
+        dict_tunings = self.client._post("tunings", {"pid": pid})["configs"]
+        for tuning_id, dict_tuning in dict_tunings.items():
+            dict_tuning["cid"] = tuning_id
+        return dict_tunings
+
     def list_tunings(self, project: "Project") -> List[Tuning]:
-        dict_tunings = self.client._post("tunings", {"pid": project.pid})
+        dict_tunings = self._list_dict_tunings(project.pid)
         retr = []
-        for tuning_id, dict_tuning in dict_tunings["configs"].items():
-            dict_tuning["cid"] = tuning_id
+        for dict_tuning in dict_tunings.values():
             retr.append(Tuning._from_dict_listing(self.client, project, dict_tuning))
         return retr
 
@@ -136,35 +235,8 @@ class Tunings:
         tags: Optional[Dict[str, str]],
         consequence: Optional[int],
         probability: Optional[str],
+        object_index: Optional["_ObjectIndex"] = None,
     ) -> Dict[str, Any]:
-        def find_object(model, name, metaconcept):
-            data = model.model
-            matching_names = []
-            for objid, objdata in data["objects"].items():
-                if objdata["name"] == name:
-                    matching_names.append(objdata)
-                    return objdata["eid"]
-            if not matching_names:
-                raise ValueError(f"Object with name '{name}' not found")
-            elif len(matching_names) == 1:
-                return matching_names[0]["id"]
-
-            # we have several matching, match metaconcept
-            matching_meta = []
-            for objdata in matching_names:
-                if objdata["metaconcept"] == metaconcept:
-                    matching_meta.append(objdata)
-            if not matching_meta:
-                raise ValueError(
-                    f"Several objects with matching name '{name}' found, but none of the supplied type '{metaconcept}'"
-                )
-            elif len(matching_meta) == 1:
-                return matching_meta[0]["id"]
-            else:
-                raise ValueError(
-                    f"Several objects with matching name '{name}' found of the supplied type '{metaconcept}'"
-                )
-
         config: Dict[str, Any] = {}
 
         # set scope, name, id
@@ -174,8 +246,10 @@ class Tunings:
             config["attackstep"] = filterdict.get("attackstep", None)
             if "metaconcept" in filterdict:
                 config["class"] = filterdict["metaconcept"]
-            config["id"] = find_object(
-                model, filterdict["object_name"], filterdict.get("metaconcept", None)
+            if object_index is None:
+                object_index = _ObjectIndex(model)
+            config["id"] = object_index.find_object(
+                filterdict["object_name"], filterdict.get("metaconcept", None)
             )
         elif "metaconcept" in filterdict:
             config["scope"] = "class"
@@ -245,8 +319,7 @@ class Tunings:
         consequence: Optional[int] = None,
         probability: Optional[str] = None,
     ) -> Tuning:
-        if tuning_type not in ["attacker", "ttc", "tag", "probability", "consequence"]:
-            raise ValueError(f"Unknown {tuning_type=}")
+        _check_tuning_type(tuning_type)
         data = Tunings._convert_to_old_format(
             project,
             model,
@@ -263,3 +336,168 @@ class Tunings:
         return Tuning.from_dict(
             client=self.client, project=project, dict_tuning=dict_tuning
         )
+
+    def validate_tunings(self, specs: List[Dict[str, Any]]) -> None:
+        """Validates tuning specs against the metadata of the server.
+
+        The metadata is fetched once per client and indexed, so specs are checked
+        without any further requests. The tuning types, and the metaconcepts and
+        attack steps of the filters are validated. Defenses are not validated
+        against the current server metadata, which does not list them, and are
+        only checked if a server includes them.
+
+        :param specs: A list of tuning specs on the format of :meth:`create_tunings`.
+        :raises ValueError: If any spec is invalid, with all errors in the message.
+        """
+        index = self.client.metadata._get_index()
+        errors = []
+        for i, spec in enumerate(specs):
+            tuning_type = spec["tuning_type"]
+            if tuning_type not in TUNING_TYPES:
+                errors.append(f"specs[{i}]: Unknown {tuning_type=}")
+            filterdict = spec["filterdict"]
+            metaconcept = filterdict.get("metaconcept")
+            attackstep = filterdict.get("attackstep")
+            defense = filterdict.get("defense")
+            if metaconcept is None:
+                attacksteps = index.all_attacksteps
+                defenses = index.all_defenses
+            elif metaconcept in index.attacksteps:
+                attacksteps = index.attacksteps[metaconcept]
+                defenses = (index.defenses or {}).get(metaconcept, set())
+            else:
+                errors.append(f"specs[{i}]: Unknown {metaconcept=}")
+                continue
+            if attackstep is not None and attackstep not in attacksteps:
+                errors.append(f"specs[{i}]: Unknown {attackstep=}")
+            if (
+                defense is not None
+                and index.defenses is not None
+                and defense not in defenses
+            ):
+                errors.append(f"specs[{i}]: Unknown {defense=}")
+        if errors:
+            raise ValueError("Invalid tunings\n" + "\n".join(errors))
+
+    def create_tunings(
+        self,
+        project: "Project",
+        model: "Model",
+        specs: List[Dict[str, Any]],
+        chunk_size: int = 100,
+        validate: bool = False,
+    ) -> List[Tuning]:
+        """Creates many tunings with as few requests as possible.
+
+        :param project: The :class:`Project` to create the tunings in.
+        :param model: The model the tunings refer to.
+        :param specs: A list of dictionaries with the keyword arguments of :meth:`create_tuning`, e.g.
+
+            .. code-block::
+
+                {
+                    "tuning_type": "ttc",
+                    "op": "apply",
+                    "filterdict": {"attackstep": "HighPrivilegeAccess", "object_name": "i-1"},
+                    "ttc": "Exponential,3",
+                }
+        :param chunk_size: (optional) The maximum number of tunings to send per request.
+        :param validate: (optional) Whether to check the specs with :meth:`validate_tunings` first.
+        :return: A list of the created :class:`Tuning` objects, in the same order as ``specs``.
+        """
+        if validate:
+            self.validate_tunings(specs)
+        configs = self._convert_specs(project, model, specs)
+        return self._put_configs(project, configs, chunk_size)
+
+    def sync(
+        self,
+        project: "Project",
+        model: "Model",
+        desired: List[Dict[str, Any]],
+        chunk_size: int = 100,
+        validate: bool = False,
+    ) -> List[Tuning]:
+        """Makes the tunings of a project match a desired set of tunings.
+
+        Existing tunings that match a desired tuning are kept, so references to
+        them from scenarios stay valid. Only the missing tunings are created, and
+        only the tunings that are not desired are deleted.
+
+        :param project: The :class:`Project` to synchronize the tunings of.
+        :param model: The model the tunings refer to.
+        :param desired: A list of tuning specs on the format of :meth:`create_tunings`.
+        :param chunk_size: (optional) The maximum number of tunings to create or delete per request.
+        :param validate: (optional) Whether to check the specs with :meth:`validate_tunings` first.
+        :return: A list of :class:`Tuning` objects, in the same order as ``desired``.
+        """
+        if validate:
+            self.validate_tunings(desired)
+        dict_tunings = self._list_dict_tunings(project.pid)
+        existing: Dict[Tuple[Optional[str], ...], List[str]] = {}
+        for tuning_id, dict_tuning in dict_tunings.items():
+            existing.setdefault(_canonical_config(dict_tuning), []).append(tuning_id)
+
+        tunings: List[Optional[Tuning]] = []
+        to_create: List[Dict[str, Any]] = []
+        for config in self._convert_specs(project, model, desired):
+            tuning_ids = existing.get(_canonical_config(config))
+            if tuning_ids:
+                dict_tuning = dict_tunings[tuning_ids.pop()]
+                tunings.append(
+                    Tuning._from_dict_listing(self.client, project, dict_tuning)
+                )
+            else:
+                tunings.append(None)
+                to_create.append(config)
+        to_delete = [tuning_id for ids in existing.values() for tuning_id in ids]
+
+        for i in range(0, len(to_delete), chunk_size):
+            data: Dict[str, Any] = {
+                "pid": project.pid,
+                "cids": to_delete[i : i + chunk_size],
+            }
+            self.client._delete("tunings", data)
+        created = iter(self._put_configs(project, to_create, chunk_size))
+        return [next(created) if t is None else t for t in tunings]
+
+    def _put_configs(
+        self, project: "Project", configs: List[Dict[str, Any]], chunk_size: int
+    ) -> List[Tuning]:
+        tunings = []
+        for i in range(0, len(configs), chunk_size):
+            data: Dict[str, Any] = {
+                "pid": project.pid,
+                "configs": configs[i : i + chunk_size],
+            }
+            for dict_tuning in self.client._put("tunings", data):
+                tunings.append(
+                    Tuning.from_dict(
+                        client=self.client, project=project, dict_tuning=dict_tuning
+                    )
+                )
+        return tunings
+
+    @staticmethod
+    def _convert_specs(
+        project: "Project", model: "Model", specs: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        object_index = _ObjectIndex(model)
+        configs = []
+        for spec in specs:
+            _check_tuning_type(spec["tuning_type"])
+            data = Tunings._convert_to_old_format(
+                project,
+                model,
+                spec["tuning_type"],
+                op=spec["op"],
+                filterdict=spec["filterdict"],
+                name=spec.get("name"),
+                ttc=spec.get("ttc", ""),
+                tags=spec.get("tags"),
+                consequence=spec.get("consequence"),
+                probability=spec.get("probability"),
+                object_index=object_index,
+            )
+            configs.extend(data["configs"])
+        return configs
@@ -13,7 +13,9 @@
 # limitations under the License.
 
 from enum import Enum, unique
-from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional
+
+from securicad.enterprise.index import _Resolver
 
 if TYPE_CHECKING:
     from securicad.enterprise.client import Client
@@ -36,6 +38,16 @@ class Role(Enum):
 
 
 class User:
+    __slots__ = (
+        "client",
+        "uid",
+        "username",
+        "firstname",
+        "lastname",
+        "role",
+        "organization",
+    )
+
     def __init__(
         self,
         client: "Client",
@@ -54,6 +66,14 @@ class User:
         self.role = role
         self.organization = organization
 
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, User):
+            return NotImplemented
+        return self.uid == other.uid
+
+    def __hash__(self) -> int:
+        return hash(self.uid)
+
     @staticmethod
     def from_dict(client: "Client", dict_user: Dict[str, Any]) -> "User":
         return User(
@@ -83,12 +103,14 @@ class User:
         if password is not None:
             data["password"] = password
         dict_user = self.client._post("user", data)["user"]
+        self.client.users._name_index.invalidate()
         self.username = dict_user["email"]
         self.firstname = dict_user["firstname"]
         self.lastname = dict_user["lastname"]
 
     def delete(self) -> None:
         self.client._delete("user", {"uid": self.uid})
+        self.client.users._name_index.invalidate()
 
     def set_role(self, role: Role) -> None:
         to_add = [x for x in role.value if x not in self.role.value]
@@ -97,17 +119,39 @@ class User:
             self.client._put("user/roles", {"uid": self.uid, "roles": to_add})
         if to_remove:
             self.client._delete("user/roles", {"uid": self.uid, "roles": to_remove})
+        self.client.users._name_index.invalidate()
         self.role = role
 
 
 class Users:
     def __init__(self, client: "Client") -> None:
         self.client = client
+        # All users by uid and username, reused for a few seconds
+        self._name_index: _Resolver[None, Dict[str, Any]] = _Resolver(
+            lambda _: self._list_dict_users(),
+            get_name=lambda u: u["email"],
+            get_key=lambda u: u["uid"],
+            ttl=5,
+        )
 
     def _list_dict_users(self) -> List[Dict[str, Any]]:
         dict_users = self.client._post("users")["users"]
         return dict_users
 
+    def _get_users_by_uids(self, uids: Iterable[int]) -> List[User]:
+        index = self._name_index.get_index(None)
+        users = []
+        for uid in uids:
+            dict_user = index.by_key.get(uid)
+            if dict_user is None:
+                # The user may have been created after the index was built
+                index = self._name_index.get_index(None, refresh=True)
+                dict_user = index.by_key.get(uid)
+            if dict_user is None:
+                raise ValueError(f"Invalid user {uid}")
+            users.append(User.from_dict(client=self.client, dict_user=dict_user))
+        return users
+
     def whoami(self) -> User:
         dict_user = self.client._get("whoami")
         dict_user["uid"] = dict_user["id"]
@@ -129,19 +173,13 @@ class Users:
         return users
 
     def get_user_by_uid(self, uid: int) -> User:
-        for user in self.list_users():
-            if user.uid == uid:
-                return user
-        raise ValueError(f"Invalid user {uid}")
+        return self._get_users_by_uids([uid])[0]
 
     def get_user_by_username(self, username: str) -> User:
-        for user in self.list_users():
-            if user.username == username:
-                return user
-        for user in self.list_users():
-            if user.username.lower() == username.lower():
-                return user
-        raise ValueError(f"Invalid user {username}")
+        dict_user = self._name_index.find_by_name(None, username)
+        if dict_user is None:
+            raise ValueError(f"Invalid user {username}")
+        return User.from_dict(client=self.client, dict_user=dict_user)
 
     def create_user(
         self,
@@ -163,4 +201,5 @@ class Users:
         if organization is not None:
             data["organization"] = organization.tag
         dict_user = self.client._put("user", data)
+        self._name_index.invalidate()
         return User.from_dict(client=self.client, dict_user=dict_user)
@@ -69,5 +69,6 @@ setuptools.setup(
     keywords="securicad enterprise threat modeling",
     packages=["securicad.enterprise"],
     install_requires=get_requirements(),
+    extras_require={"analysis": ["numpy", "pandas"], "parquet": ["pyarrow"]},
     python_requires=">=3.6",
 )
@@ -0,0 +1,119 @@
+# Copyright 2020-2021 Foreseeti AB <https://foreseeti.com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Set, Tuple
+
+# isort: off
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from securicad.enterprise.scenarios import Scenarios
+from securicad.enterprise.simulations import Simulations
+
+# isort: on
+
+Handler = Callable[[Any], Any]
+
+
+class FakeClient:
+    """A client that answers requests with handlers instead of a server.
+
+    ``handlers`` maps ``(method, endpoint)`` to a function of the request data
+    that returns the response, or raises.
+    """
+
+    def __init__(self, handlers: Dict[Tuple[str, str], Handler]) -> None:
+        self._base_url = "https://enterprise.example/"
+        self.handlers = handlers
+        self.requests: List[Tuple[str, str, Any]] = []
+        self.lock = threading.Lock()
+        self.scenarios = Scenarios(client=self)  # type: ignore
+        self.simulations = Simulations(client=self)  # type: ignore
+        self.simulations._poller.min_interval = 0.01
+        self.simulations._poller.interval = 0.01
+
+    def count(self, method: str, endpoint: str) -> int:
+        with self.lock:
+            return sum(1 for r in self.requests if r[:2] == (method, endpoint))
+
+    def __request(self, method: str, endpoint: str, data: Any) -> Any:
+        with self.lock:
+            self.requests.append((method, endpoint, data))
+        return self.handlers[(method, endpoint)](data)
+
+    def _get(self, endpoint: str, data: Any = None) -> Any:
+        return self.__request("GET", endpoint, data)
+
+    def _post(self, endpoint: str, data: Any = None) -> Any:
+        return self.__request("POST", endpoint, data)
+
+    def _put(self, endpoint: str, data: Any = None) -> Any:
+        return self.__request("PUT", endpoint, data)
+
+    def _delete(self, endpoint: str, data: Any = None) -> Any:
+        return self.__request("DELETE", endpoint, data)
+
+
+class FakeSimulations:
+    """Server-side simulations whose progress is set by the test."""
+
+    def __init__(self, pid: str = "pid") -> None:
+        self.pid = pid
+        self.progress: Dict[str, int] = {}
+        self.fail_batch = 0
+        # Progress of new simulations, and (simid, thread name) of each creation
+        self.initial_progress = 100
+        self.created: List[Tuple[str, str]] = []
+        self.risks: Dict[str, List[Dict[str, Any]]] = {}
+        self.deleted: Set[str] = set()
+
+    def dict_simulation(self, simid: str) -> Dict[str, Any]:
+        return {
+            "pid": self.pid,
+            "basemodel": "tid",
+            "mid": simid,
+            "name": simid,
+            "progress": self.progress[simid],
+        }
+
+    def simulations_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        if len(data["simids"]) > 1 and self.fail_batch > 0:
+            self.fail_batch -= 1
+            raise ConnectionError("batch failed")
+        return {
+            simid: self.dict_simulation(simid)
+            for simid in data["simids"]
+            if simid in self.progress
+        }
+
+    def simulation_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        if data["simid"] in self.deleted:
+            raise KeyError(data["simid"])
+        risks = self.risks.get(data["simid"], [])
+        return {"results": {"risks": risks}, "simid": data["simid"]}
+
+    def create_simulation(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        simid = data.get("name") or f"simulation{len(self.created)}"
+        self.progress[simid] = self.initial_progress
+        self.created.append((simid, threading.current_thread().name))
+        return {"simid": simid}
+
+    def handlers(self) -> Dict[Tuple[str, str], Handler]:
+        return {
+            ("PUT", "simulation"): self.create_simulation,
+            ("POST", "simulations/data"): self.simulations_data,
+            ("POST", "simulation/data"): self.simulation_data,
+        }
@@ -0,0 +1,148 @@
+# Copyright 2020-2021 Foreseeti AB <https://foreseeti.com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import sys
+from pathlib import Path
+
+from fakes import FakeClient, FakeSimulations
+
+# isort: off
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from securicad.enterprise.cache import ResultCache, _DedupeIndex
+from securicad.enterprise.results import SimulationResult
+from securicad.enterprise.simulations import Simulation
+
+# isort: on
+
+
+SERVER = "https://enterprise.example/"
+
+
+def test_result_cache_get_put(tmp_path):
+    cache = ResultCache(tmp_path)
+    assert not cache.contains(SERVER, "pid", "simid")
+    assert cache.get(SERVER, "pid", "simid") is None
+    cache.put(SERVER, "pid", "simid", {"results": {"risks": []}})
+    assert cache.contains(SERVER, "pid", "simid")
+    assert cache.get(SERVER, "pid", "simid") == {"results": {"risks": []}}
+    assert not cache.contains("https://other.example/", "pid", "simid")
+
+    # The entries are persisted
+    cache = ResultCache(tmp_path)
+    assert cache.contains(SERVER, "pid", "simid")
+    assert cache.get(SERVER, "pid", "simid") == {"results": {"risks": []}}
+
+
+def test_result_cache_evicts_least_recently_used(tmp_path):
+    cache = ResultCache(tmp_path)
+    cache.put(SERVER, "pid", "a", {"data": "a"})
+    (path,) = tmp_path.glob("*.json.gz")
+    cache.max_size = 2 * path.stat().st_size
+    cache.put(SERVER, "pid", "b", {"data": "b"})
+    # The access time is persisted, and seen by other instances
+    ResultCache(tmp_path).get(SERVER, "pid", "a")
+    cache.put(SERVER, "pid", "c", {"data": "c"})
+    assert cache.contains(SERVER, "pid", "a")
+    assert not cache.contains(SERVER, "pid", "b")
+    assert cache.contains(SERVER, "pid", "c")
+    assert len(list(tmp_path.glob("*.json.gz"))) == 2
+
+
+def test_result_cache_shared_directory(tmp_path):
+    # Instances that share a directory, e.g. in other processes, enforce
+    # max_size over all entries
+    caches = [ResultCache(tmp_path) for _ in range(2)]
+    caches[0].put(SERVER, "pid", "a", {"data": "a"})
+    (path,) = tmp_path.glob("*.json.gz")
+    for cache in caches:
+        cache.max_size = 2 * path.stat().st_size
+    caches[1].put(SERVER, "pid", "b", {"data": "b"})
+    caches[0].put(SERVER, "pid", "c", {"data": "c"})
+    assert not caches[1].contains(SERVER, "pid", "a")
+    assert caches[0].contains(SERVER, "pid", "b")
+    assert len(list(tmp_path.glob("*.json.gz"))) == 2
+
+
+def test_result_cache_corrupt_entry(tmp_path):
+    cache = ResultCache(tmp_path)
+    cache.put(SERVER, "pid", "simid", {"data": "a"})
+    (path,) = tmp_path.glob("*.json.gz")
+    path.write_bytes(b"corrupt")
+    assert cache.get(SERVER, "pid", "simid") is None
+    assert not cache.contains(SERVER, "pid", "simid")
+
+
+def test_dedupe_index(tmp_path):
+    index = _DedupeIndex(tmp_path / "simulations")
+    assert index.get("fingerprint") is None
+    index.put("fingerprint", "pid", "simid")
+    assert index.get("fingerprint") == ("pid", "simid")
+
+    # The index is persisted
+    index = _DedupeIndex(tmp_path / "simulations")
+    assert index.get("fingerprint") == ("pid", "simid")
+    index.remove("fingerprint")
+    assert _DedupeIndex(tmp_path / "simulations").get("fingerprint") is None
+
+
+def test_dedupe_index_shared_directory(tmp_path):
+    # Instances that share a directory, e.g. in other processes, do not lose
+    # each other's entries
+    a = _DedupeIndex(tmp_path / "simulations")
+    b = _DedupeIndex(tmp_path / "simulations")
+    a.put("a", "pid", "simid-a")
+    b.put("b", "pid", "simid-b")
+    assert a.get("b") == ("pid", "simid-b")
+    assert b.get("a") == ("pid", "simid-a")
+    b.remove("a")
+    assert a.get("a") is None
+
+
+def test_dedupe_index_in_memory():
+    index = _DedupeIndex()
+    index.put("fingerprint", "pid", "simid")
+    assert index.get("fingerprint") == ("pid", "simid")
+    index.remove("fingerprint")
+    assert index.get("fingerprint") is None
+
+
+def test_result_cache_parses_sections_lazily(tmp_path):
+    cache = ResultCache(tmp_path)
+    cache.put(SERVER, "pid", "simid", {"results": {"risks": []}, "attackpaths": [1, 2]})
+    result = ResultCache(tmp_path).get(SERVER, "pid", "simid")
+    assert set(result) == {"results", "attackpaths"}
+    assert result["results"] == {"risks": []}
+    assert result.is_loaded("results")
+    assert not result.is_loaded("attackpaths")
+    assert result.to_dict() == {"results": {"risks": []}, "attackpaths": [1, 2]}
+
+
+def test_get_results_from_cache_is_dict(tmp_path):
+    client = FakeClient(FakeSimulations().handlers())
+    client.simulations.result_cache = ResultCache(tmp_path)
+    simulation = Simulation(client, "pid", "tid", "simid", "name", 100)
+    results = simulation.get_results()
+    assert isinstance(results, dict)
+    assert client.count("POST", "simulation/data") == 1
+
+    results = simulation.get_results()
+    assert client.count("POST", "simulation/data") == 1
+    assert isinstance(results, dict)
+    assert json.loads(json.dumps(results)) == results
+    results["note"] = "mutable"
+    lazy = simulation.get_results(lazy=True)
+    assert isinstance(lazy, SimulationResult)
+    assert not lazy.is_loaded("results")
@@ -0,0 +1,73 @@
+# Copyright 2020-2021 Foreseeti AB <https://foreseeti.com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sys
+from pathlib import Path
+
+# isort: off
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from securicad.enterprise.index import _IndexCache, _NameIndex, _Resolver
+
+# isort: on
+
+
+def test_name_index_find():
+    items = [("1", "Name"), ("2", "name"), ("3", "Other")]
+    index = _NameIndex(items, get_name=lambda i: i[1], get_key=lambda i: i[0])
+    assert index.find("name") == ("2", "name")
+    assert index.find("NAME") == ("1", "Name")
+    assert index.find("other") == ("3", "Other")
+    assert index.find("missing") is None
+    assert index.by_key["3"] == ("3", "Other")
+
+
+def test_index_cache():
+    builds = []
+
+    def build():
+        builds.append(None)
+        return len(builds)
+
+    cache = _IndexCache(ttl=60)
+    assert cache.get("key", build) == 1
+    assert cache.get("key", build) == 1
+    cache.invalidate("key")
+    assert cache.get("key", build) == 2
+
+    cache.ttl = 0
+    assert cache.get("key", build) == 3
+
+
+def test_resolver():
+    calls = []
+
+    def list_items(scope):
+        calls.append(scope)
+        return [{"id": 1, "name": "Name"}, {"id": 2, "name": f"{scope} only"}]
+
+    resolver = _Resolver(
+        list_items, get_name=lambda i: i["name"], get_key=lambda i: i["id"]
+    )
+    assert resolver.find_by_name("a", "NAME")["id"] == 1
+    assert resolver.find_by_key("a", 2)["name"] == "a only"
+    assert calls == ["a", "a"]
+
+    # With a ttl the index is reused, and a miss rebuilds it once
+    resolver.ttl = 60
+    assert resolver.find_by_name("b", "b ONLY")["id"] == 2
+    assert resolver.find_by_name("b", "name")["id"] == 1
+    assert calls == ["a", "a", "b"]
+    assert resolver.find_by_name("b", "missing") is None
+    assert calls == ["a", "a", "b", "b"]
@@ -12,17 +12,23 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import io
 import sys
+import threading
 from pathlib import Path
+from types import SimpleNamespace
 
 import pytest
 
 import utils
+from fakes import FakeClient
 
 # isort: off
 
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 from securicad.enterprise.exceptions import StatusCodeException
+from securicad.enterprise.models import ModelInfo, Models
+from securicad.enterprise.projects import Project
 
 # isort: on
 
@@ -41,3 +47,131 @@ from securicad.enterprise.exceptions import StatusCodeException
 # test_modelinfo_get_dict()
 # test_modelinfo_get_model()
 # test_modelinfo_save()
+
+
+class FakeModels:
+    """Server-side models that are validated after being listed once, when
+    ``validating`` is set."""
+
+    def __init__(self):
+        self.models = {}
+        self.validating = threading.Event()
+        self.validating.set()
+
+    def add(self, pid, name, description=""):
+        mid = f"model{len(self.models)}"
+        self.models[mid] = {
+            "pid": pid,
+            "mid": mid,
+            "name": name,
+            "description": description,
+            "valid": 0,
+            "validation_issues": "",
+        }
+        return dict(self.models[mid])
+
+    def put_models(self, data):
+        (file,) = data["files"][0]
+        if file["filename"].startswith("bad"):
+            raise ConnectionError("upload failed")
+        name = file["filename"][: -len(".sCAD")]
+        return [self.add(data["pid"], name, file.get("description", ""))]
+
+    def save_model(self, data):
+        self.models[data["model"]["mid"]]["valid"] = 0
+
+    def save_model_as(self, data):
+        return self.add(data["pid"], data["model"]["name"][: -len(".sCAD")])
+
+    def generate_model(self, data):
+        return self.add("pid", data["name"])
+
+    def list_models(self, data):
+        dict_models = [dict(m) for m in self.models.values()]
+        if self.validating.is_set():
+            for dict_model in self.models.values():
+                dict_model["valid"] = 2 if dict_model["name"] == "invalid" else 1
+        return dict_models
+
+    def get_client(self):
+        client = FakeClient(
+            {
+                ("PUT", "models"): self.put_models,
+                ("POST", "models"): self.list_models,
+                ("POST", "savemodel"): self.save_model,
+                ("POST", "savemodelas"): self.save_model_as,
+                ("POST", "projects/pid/multiparser"): self.generate_model,
+            }
+        )
+        client.models = Models(client)
+        client.models._validation_poller.interval = 0.01
+        return client
+
+
+def test_upload_many():
+    server = FakeModels()
+    client = server.get_client()
+    project = Project(client, "pid", "project", "", None)
+    files = [
+        {"filename": f"{name}.sCAD", "file": io.BytesIO(b"model")}
+        for name in ["valid", "bad", "invalid"]
+    ]
+    results = client.models.upload_many(project, files, max_workers=2)
+    assert isinstance(results[0], ModelInfo) and results[0].is_valid
+    assert isinstance(results[1], ConnectionError)
+    assert isinstance(results[2], ModelInfo) and results[2].is_valid is False
+    assert [r.name for r in results if isinstance(r, ModelInfo)] == ["valid", "invalid"]
+
+
+def check_validation_future(server, future, name):
+    # The future is resolved once the server has validated the model
+    assert not future.done()
+    callbacks = []
+    called = threading.Event()
+    future.add_done_callback(lambda f: (callbacks.append(f), called.set()))
+    server.validating.set()
+    model_info = future.result(timeout=5)
+    assert future.done()
+    assert called.wait(timeout=5)
+    assert callbacks == [future]
+    assert model_info.name == name
+    assert model_info.is_valid
+
+
+def test_modelinfo_save_async():
+    server = FakeModels()
+    client = server.get_client()
+    model_info = ModelInfo.from_dict(client, server.add("pid", "model"))
+    server.validating.clear()
+    future = model_info.save_async(SimpleNamespace(model={}))
+    check_validation_future(server, future, "model")
+
+
+def test_save_as_async():
+    server = FakeModels()
+    client = server.get_client()
+    project = Project(client, "pid", "project", "", None)
+    server.validating.clear()
+    future = client.models.save_as_async(project, SimpleNamespace(model={}), "copy")
+    check_validation_future(server, future, "copy")
+
+
+def test_upload_scad_model_async():
+    server = FakeModels()
+    client = server.get_client()
+    project = Project(client, "pid", "project", "", None)
+    server.validating.clear()
+    future = client.models.upload_scad_model_async(
+        project, "uploaded.sCAD", io.BytesIO(b"model")
+    )
+    check_validation_future(server, future, "uploaded")
+
+
+def test_generate_model_async():
+    server = FakeModels()
+    client = server.get_client()
+    project = Project(client, "pid", "project", "", None)
+    server.validating.clear()
+    files = [{"sub_parser": "aws", "name": "aws.json", "file": io.BytesIO(b"{}")}]
+    future = client.models.generate_model_async(project, "aws", "generated", files)
+    check_validation_future(server, future, "generated")
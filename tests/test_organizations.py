@@ -520,6 +520,18 @@ def test_org_list_users(data):
     client.logout()
 
 
+def test_org_list_users_request_count(client, monkeypatch):
+    org = client.organizations.list_organizations()[0]
+    urls = utils.record_request_urls(client, monkeypatch)
+
+    # Members are resolved against one users call
+    users = org.list_users()
+    assert urls == [utils.get_url(f"organization/{org.tag}"), utils.get_url("users")]
+    for user in users:
+        assert client.users.get_user_by_username(user.username) == user
+    assert len(urls) == 2
+
+
 def test_org_list_projects(data):
     def assert_org_list_projects(org):
         projects = org.list_projects()
@@ -602,3 +614,16 @@ def test_org_list_projects(data):
     org_.delete()
     assert_org_list_projects_invalid(org_)
     client.logout()
+
+
+def test_org_list_projects_request_count(data, client, monkeypatch):
+    org = client.organizations.list_organizations()[0]
+    urls = utils.record_request_urls(client, monkeypatch)
+
+    # The projects are built from one projects call
+    projects = org.list_projects()
+    assert len(projects) == len(data["organizations"][org.name]["projects"])
+    assert urls == [
+        utils.get_url(f"organization/{org.tag}"),
+        utils.get_url("projects"),
+    ]
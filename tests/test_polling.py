@@ -0,0 +1,157 @@
+# Copyright 2020-2021 Foreseeti AB <https://foreseeti.com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+from fakes import FakeClient, FakeSimulations
+
+# isort: off
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from securicad.enterprise.polling import Poller
+from securicad.enterprise.simulations import Simulation
+
+# isort: on
+
+
+class FakePoller(Poller):
+    def __init__(self):
+        super().__init__(interval=0.01)
+        self.results = {}
+        self.polling = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+        self.polls = []
+
+    def _poll(self, pid, keys):
+        self.polls.append(keys)
+        # The state of the items when the request is made
+        results = dict(self.results)
+        self.polling.set()
+        self.release.wait()
+        return {key: results[key] for key in keys if key in results}
+
+
+def test_poller_cancel():
+    poller = FakePoller()
+    cancelled = poller.submit("pid", "a")
+    waiting = poller.submit("pid", "a")
+    assert cancelled is not waiting
+    assert cancelled.cancel()
+    poller.results["a"] = 1
+    assert waiting.result(timeout=5) == 1
+
+    # The poller keeps working after a cancelled future is dropped
+    poller.submit("pid", "b").cancel()
+    poller.results["c"] = 3
+    assert poller.submit("pid", "c").result(timeout=5) == 3
+
+
+def test_poller_exception_result():
+    poller = FakePoller()
+    poller.results["a"] = ValueError("a")
+    poller.results["b"] = 2
+    failed = poller.submit("pid", "a")
+    assert isinstance(failed.exception(timeout=5), ValueError)
+    assert poller.submit("pid", "b").result(timeout=5) == 2
+
+
+def test_poller_resolves_only_earlier_submissions():
+    poller = FakePoller()
+    poller.results["a"] = "old"
+    poller.release.clear()
+    first = poller.submit("pid", "a")
+    assert poller.polling.wait(timeout=5)
+
+    # Submitted while a poll is in flight, so that poll must not resolve it
+    second = poller.submit("pid", "a")
+    poller.results["a"] = "new"
+    poller.release.set()
+    assert first.result(timeout=5) == "old"
+    assert second.result(timeout=5) == "new"
+
+
+def test_poller_batches_submissions_to_one_project():
+    poller = FakePoller()
+    poller.interval = 0.2
+    futures = [poller.submit("pid", str(i)) for i in range(100)]
+    poller.results.update({str(i): i for i in range(100)})
+    assert [f.result(timeout=5) for f in futures] == list(range(100))
+    # Only the first submission wakes up the poller
+    assert len(poller.polls) <= 3
+
+
+def get_simulation(client, simid):
+    return Simulation(client, "pid", "tid", simid, simid, 0)
+
+
+def test_simulation_poller_missing_simid():
+    server = FakeSimulations()
+    client = FakeClient(server.handlers())
+    server.progress["a"] = 50
+    running = get_simulation(client, "a")._wait_async()
+    gone = get_simulation(client, "gone")._wait_async()
+    assert isinstance(gone.exception(timeout=5), ValueError)
+    assert not running.done()
+    server.progress["a"] = 100
+    assert running.result(timeout=5) == 100
+
+
+def test_simulation_poller_batch_error():
+    server = FakeSimulations()
+    client = FakeClient(server.handlers())
+    server.progress.update({"a": 100, "b": 100})
+    server.fail_batch = 1
+    futures = [get_simulation(client, simid)._wait_async() for simid in "ab"]
+    assert [f.result(timeout=5) for f in futures] == [100, 100]
+
+
+def test_simulation_poller_interval_ignores_done_simulations():
+    server = FakeSimulations()
+    client = FakeClient(server.handlers())
+    poller = client.simulations._poller
+    poller.max_interval = 30
+    server.progress["a"] = 100
+    future = get_simulation(client, "a")._wait_async()
+    future.result(timeout=5)
+    get_simulation(client, "cancelled")._wait_async().cancel()
+    poller.min_interval = 1
+    server.progress["b"] = 50
+    get_simulation(client, "b")._wait_async()
+    time.sleep(0.1)
+    with poller._lock:
+        assert set(poller._estimates) <= {("pid", "b")}
+    assert poller._get_interval() > 0
+
+
+def test_simulation_poller_polls_whole_project():
+    server = FakeSimulations()
+    client = FakeClient(server.handlers())
+    poller = client.simulations._poller
+    poller.min_interval = poller.interval = 0.5
+    futures = []
+    for i in range(50):
+        server.progress[str(i)] = 50
+        futures.append(get_simulation(client, str(i))._wait_async())
+        time.sleep(0.002)
+    time.sleep(1.5)
+    for simid in server.progress:
+        server.progress[simid] = 100
+    assert all(f.result(timeout=10) == 100 for f in futures)
+    requests = [r for r in client.requests if r[1] == "simulations/data"]
+    assert len(requests) <= 8
+    assert max(len(r[2]["simids"]) for r in requests) == 50
@@ -38,6 +38,17 @@ from securicad.enterprise.exceptions import StatusCodeException
 # test_project_remove_user()
 # test_project_get_access_level()
 # test_project_set_access_level()
-# test_project_list_models()
 # test_project_import_models()
 # test_project_list_scenarios()
+
+
+def test_project_list_models(client, project, model, monkeypatch):
+    urls = utils.record_request_urls(client, monkeypatch)
+
+    # One models call for the whole project, model data is fetched lazily
+    model_infos = project.list_models()
+    assert urls == [utils.get_url("models")]
+    assert len(model_infos) == 1
+    assert isinstance(model_infos[0].samples, int)
+    assert isinstance(model_infos[0].threshold, int)
+    assert urls == [utils.get_url("models"), utils.get_url("modeldata")]
@@ -0,0 +1,106 @@
+# Copyright 2020-2021 Foreseeti AB <https://foreseeti.com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import pytest
+
+# isort: off
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from securicad.enterprise.results import ResultSet, diff_results
+
+# isort: on
+
+np = pytest.importorskip("numpy")
+
+
+def get_result(risks: List[Tuple[str, float, Optional[int]]]) -> Dict[str, Any]:
+    return {
+        "results": {
+            "risks": [
+                {
+                    "id": object_id,
+                    "name": f"object {object_id}",
+                    "metaconcept": "S3Bucket",
+                    "attackstep": "ReadObject",
+                    "ttc5": 1.0,
+                    "ttc50": ttc50,
+                    "ttc95": 100.0,
+                    "probability": 0.5,
+                    "consequence": consequence,
+                }
+                for object_id, ttc50, consequence in risks
+            ]
+        }
+    }
+
+
+def get_result_set() -> ResultSet:
+    return ResultSet.from_results(
+        ["a", "b"],
+        [
+            get_result([("1", 1.0, 2), ("2", 5.0, 4)]),
+            get_result([("1", 2.0, None), ("2", 7.0, 4), ("3", 9.0, 1)]),
+        ],
+    )
+
+
+def test_result_set_columns():
+    result_set = get_result_set()
+    assert len(result_set) == 5
+    assert list(result_set["simulation"]) == [0, 0, 1, 1, 1]
+    assert list(result_set["object_id"]) == ["1", "2", "1", "2", "3"]
+    assert np.isnan(result_set["risk"][2])
+
+
+def test_result_set_aggregate():
+    result_set = get_result_set()
+    assert list(result_set.aggregate("ttc50", "sum")) == [6.0, 18.0]
+    assert list(result_set.aggregate("risk", "mean")) == [1.5, 1.25]
+    assert list(result_set.aggregate("risk", "max")) == [2.0, 2.0]
+    assert list(result_set.aggregate("risk", "count")) == [2, 2]
+    with pytest.raises(ValueError):
+        result_set.aggregate("risk", "median")
+
+
+def test_result_set_filter():
+    result_set = get_result_set()
+    filtered = result_set.filter(result_set["ttc50"] > 4, simulation=1)
+    assert list(filtered["object_id"]) == ["2", "3"]
+
+
+def test_result_set_compare():
+    keys, delta = get_result_set().compare("ttc50", baseline="a")
+    assert keys == [("1", "ReadObject"), ("2", "ReadObject"), ("3", "ReadObject")]
+    assert list(delta[0]) == [0.0, 1.0]
+    assert list(delta[1]) == [0.0, 2.0]
+    assert np.isnan(delta[2]).all()
+
+
+def test_diff_results():
+    a = get_result([("1", 1.0, 2), ("2", 5.0, 4)])
+    b = get_result([("1", 2.0, 2), ("3", 9.0, 1)])
+    diff = diff_results(a, b)
+    assert [d["object_id"] for d in diff["changed_ttc"]] == ["1"]
+    assert diff["changed_ttc"][0]["ttc50"] == [1.0, 2.0]
+    assert [d["object_id"] for d in diff["newly_reachable"]] == ["3"]
+    assert [d["object_id"] for d in diff["newly_unreachable"]] == ["2"]
+    assert [(d["object_id"], d["delta"]) for d in diff["risk"]] == [
+        ("2", -2.0),
+        ("3", 0.5),
+    ]
+    assert diff["total_risk_delta"] == -1.5
@@ -18,11 +18,14 @@ from pathlib import Path
 import pytest
 
 import utils
+from fakes import FakeClient, FakeSimulations
 
 # isort: off
 
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 from securicad.enterprise.exceptions import StatusCodeException
+from securicad.enterprise.models import ModelInfo
+from securicad.enterprise.projects import Project
 
 # isort: on
 
@@ -34,3 +37,67 @@ from securicad.enterprise.exceptions import StatusCodeException
 # test_scenario_update()
 # test_scenario_delete()
 # test_scenario_list_simulations()
+
+
+class FakeScenarios:
+    """Server-side scenarios that each start one initial simulation."""
+
+    def __init__(self, simulations):
+        self.simulations = simulations
+        self.scenarios = {}
+
+    def put_scenario(self, data):
+        if data["name"].startswith("bad"):
+            raise ConnectionError("create failed")
+        tid = f"scenario{len(self.scenarios)}"
+        self.scenarios[tid] = {
+            "pid": data["pid"],
+            "tid": tid,
+            "name": data["name"],
+            "description": data["description"],
+        }
+        self.simulations.create_simulation({"name": f"{tid}-initial"})
+        return dict(self.scenarios[tid])
+
+    def get_scenario(self, data):
+        simid = f"{data['tid']}-initial"
+        dict_simulation = self.simulations.dict_simulation(simid)
+        dict_simulation["basemodel"] = data["tid"]
+        return {**self.scenarios[data["tid"]], "results": {simid: dict_simulation}}
+
+    def handlers(self):
+        return {
+            **self.simulations.handlers(),
+            ("PUT", "scenario"): self.put_scenario,
+            ("POST", "scenario/data"): self.get_scenario,
+        }
+
+
+@pytest.mark.parametrize("wait", [False, True])
+def test_create_scenarios(wait):
+    server = FakeScenarios(FakeSimulations())
+    client = FakeClient(server.handlers())
+    project = Project(client, "pid", "project", "", None)
+    model_info = ModelInfo(
+        client, "pid", "mid", "model", "", None, None, None, True, ""
+    )
+    rows = client.scenarios.create_scenarios(
+        project,
+        [(model_info, name, None) for name in ["a", "bad", "b"]],
+        max_workers=2,
+        wait=wait,
+    )
+    assert [row["scenario"] and row["scenario"].name for row in rows] == [
+        "a",
+        None,
+        "b",
+    ]
+    assert isinstance(rows[1]["error"], ConnectionError)
+    for row in (rows[0], rows[2]):
+        assert row["error"] is None
+        if wait:
+            assert row["simulation"].tid == row["scenario"].tid
+            assert row["simulation"].progress == 100
+            assert row["results"]["results"] == {"risks": []}
+        else:
+            assert row["simulation"] is None and row["results"] is None
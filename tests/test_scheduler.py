@@ -0,0 +1,102 @@
+# Copyright 2020-2021 Foreseeti AB <https://foreseeti.com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sys
+from pathlib import Path
+
+from fakes import FakeClient, FakeSimulations
+
+# isort: off
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from securicad.enterprise.scenarios import Scenario
+from securicad.enterprise.scheduler import Priority, SimulationScheduler
+
+# isort: on
+
+
+def get_scenario(client, pid):
+    return Scenario(client, pid, "tid", "scenario", "")
+
+
+def test_scheduler_priority_and_round_robin():
+    server = FakeSimulations()
+    client = FakeClient(server.handlers())
+    scheduler = SimulationScheduler(client, max_in_flight=1)
+    server.initial_progress = 50
+    blocker = scheduler.submit(get_scenario(client, "x"), name="blocker")
+    server.initial_progress = 100
+    submissions = [
+        ("a", "a-batch", Priority.BATCH),
+        ("a", "a-normal-1", Priority.NORMAL),
+        ("a", "a-normal-2", Priority.NORMAL),
+        ("b", "b-normal", Priority.NORMAL),
+        ("c", "c-interactive", Priority.INTERACTIVE),
+    ]
+    futures = [
+        scheduler.submit(get_scenario(client, pid), name=name, priority=priority)
+        for pid, name, priority in submissions
+    ]
+    assert scheduler.in_flight() == 1
+    assert scheduler.queued() == 5
+    server.progress["blocker"] = 100
+    assert blocker.result(timeout=5).progress == 100
+    assert all(f.result(timeout=5).progress == 100 for f in futures)
+    assert [simid for simid, _ in server.created] == [
+        "blocker",
+        "c-interactive",
+        "a-normal-1",
+        "b-normal",
+        "a-normal-2",
+        "a-batch",
+    ]
+    # Simulations are not created on the poller thread
+    assert all(
+        thread.startswith(("MainThread", "SimulationScheduler"))
+        for _, thread in server.created
+    )
+
+
+def test_scheduler_cancel_queued():
+    server = FakeSimulations()
+    client = FakeClient(server.handlers())
+    scheduler = SimulationScheduler(client, max_in_flight=1)
+    server.initial_progress = 50
+    running = scheduler.submit(get_scenario(client, "pid"), name="running")
+    queued = scheduler.submit(get_scenario(client, "pid"), name="queued")
+    last = scheduler.submit(get_scenario(client, "pid"), name="last")
+    assert queued.cancel()
+    server.initial_progress = 100
+    server.progress["running"] = -1
+    assert running.result(timeout=5).progress == -1
+    assert last.result(timeout=5).progress == 100
+    assert [simid for simid, _ in server.created] == ["running", "last"]
+    assert scheduler.in_flight() == 0
+
+
+def test_scheduler_create_error():
+    server = FakeSimulations()
+    client = FakeClient(server.handlers())
+    scheduler = SimulationScheduler(client, max_in_flight=1)
+
+    def fail(data):
+        raise ConnectionError("create failed")
+
+    client.handlers[("PUT", "simulation")] = fail
+    failed = scheduler.submit(get_scenario(client, "pid"), name="failed")
+    assert isinstance(failed.exception(timeout=5), ConnectionError)
+    client.handlers[("PUT", "simulation")] = server.create_simulation
+    created = scheduler.submit(get_scenario(client, "pid"), name="created")
+    assert created.result(timeout=5).simid == "created"
+    assert scheduler.in_flight() == 0
@@ -12,17 +12,25 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
+import json
 import sys
+import time
+from concurrent.futures import TimeoutError
 from pathlib import Path
 
 import pytest
 
 import utils
+from fakes import FakeClient, FakeSimulations
 
 # isort: off
 
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 from securicad.enterprise.exceptions import StatusCodeException
+from securicad.enterprise.scenarios import Scenario
+from securicad.enterprise.simulations import Simulation
+from securicad.enterprise.tunings import Tuning
 
 # isort: on
 
@@ -33,3 +41,261 @@ from securicad.enterprise.exceptions import StatusCodeException
 # test_create_simulation()
 # test_simulation_delete()
 # test_simulation_get_results()
+# test_simulation_scheduler()
+
+
+def test_create_simulation_dedupe():
+    server = FakeSimulations()
+    client = FakeClient(server.handlers())
+    scenario = Scenario(client, "pid", "tid", "scenario", "")
+    create = client.simulations.create_simulation
+
+    # A running simulation is reused
+    server.initial_progress = 50
+    running = create(scenario, name="running", dedupe=True)
+    assert create(scenario, name="other", dedupe=True) == running
+    server.progress["running"] = 100
+    assert create(scenario, name="other", dedupe=True) == running
+    assert create(scenario, name="other", dedupe=False) != running
+
+    # A failed or deleted simulation is not
+    server.progress["running"] = -1
+    failed = create(scenario, name="failed", dedupe=True)
+    assert failed != running
+    del server.progress["failed"]
+    assert create(scenario, name="deleted", dedupe=True).simid == "deleted"
+
+    # Nor is a simulation on another server
+    client._base_url = "https://other.example/"
+    assert create(scenario, name="server", dedupe=True).simid == "server"
+
+
+def get_risk(object_id, probability):
+    return {
+        "id": object_id,
+        "name": f"name{object_id}",
+        "metaconcept": "EC2Instance",
+        "attackstep": "HighPrivilegeAccess",
+        "ttc5": 1.0,
+        "ttc50": 2.0,
+        "ttc95": 3.0,
+        "probability": probability,
+        "consequence": 5,
+    }
+
+
+def test_sweep():
+    server = FakeSimulations()
+    client = FakeClient(server.handlers())
+    scenario = Scenario(client, "pid", "tid", "scenario", "")
+    tuning = Tuning(client, None, tuning_id="cid", scope="any", ttc="attacker")
+
+    def create_simulation(data):
+        if data["cids"]:
+            raise ConnectionError("create failed")
+        return server.create_simulation(data)
+
+    client.handlers[("PUT", "simulation")] = create_simulation
+    rows = client.simulations.sweep(
+        scenario, tunings={"none": [], "tuned": [tuning]}, max_in_flight=1
+    )
+    assert [row["tunings"] for row in rows] == ["none", "tuned"]
+    assert rows[0]["error"] is None
+    assert rows[0]["simulation"].progress == 100
+    assert isinstance(rows[0]["results"], dict)
+    assert isinstance(rows[1]["error"], ConnectionError)
+    assert rows[1]["simulation"] is None and rows[1]["results"] is None
+
+
+def test_export(tmp_path):
+    server = FakeSimulations()
+    client = FakeClient(server.handlers())
+    simulations = []
+    for i in range(5):
+        simid = f"simulation{i}"
+        server.risks[simid] = [get_risk(i, 0.5), get_risk(i + 10, 0.1)]
+        simulations.append(Simulation(client, "pid", "tid", simid, simid, 100))
+    path = tmp_path / "results.ndjson"
+    server.deleted.add("gone")
+    gone = Simulation(client, "pid", "tid", "gone", "gone", 100)
+    simulations.insert(2, gone)
+    report = client.simulations.export(iter(simulations), str(path), max_workers=1)
+    assert report["rows"] == 10
+    # A simulation whose results cannot be fetched is reported
+    assert [e["simulation"] for e in report["errors"]] == [gone]
+    assert isinstance(report["errors"][0]["error"], KeyError)
+    with path.open(mode="r", encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f]
+    assert len(rows) == 10
+    assert {(row["simid"], row["object_id"]) for row in rows} == {
+        (f"simulation{i}", str(object_id))
+        for i in range(5)
+        for object_id in (i, i + 10)
+    }
+    assert all(row["pid"] == "pid" and row["tid"] == "tid" for row in rows)
+
+    with pytest.raises(ValueError):
+        client.simulations.export(simulations, str(path), format="csv")
+
+
+def test_wait_all():
+    server = FakeSimulations()
+    client = FakeClient(server.handlers())
+    simulations = []
+    for i in range(10):
+        simid = f"simulation{i}"
+        server.progress[simid] = 50
+        server.risks[simid] = [get_risk(i, 0.5)]
+        simulations.append(Simulation(client, "pid", "tid", simid, simid, 50))
+    finished = Simulation(client, "pid", "tid", "finished", "finished", 100)
+    server.risks["finished"] = [get_risk(10, 0.5)]
+    for simid in server.progress:
+        server.progress[simid] = 100
+    results = client.simulations.wait_all(
+        simulations[:5] + [finished] + simulations[5:]
+    )
+    assert [r["results"]["risks"][0]["id"] for r in results] == [
+        0,
+        1,
+        2,
+        3,
+        4,
+        10,
+        5,
+        6,
+        7,
+        8,
+        9,
+    ]
+    assert all(isinstance(r, dict) for r in results)
+    # All pending simulations of the project are polled with one request
+    requests = [r for r in client.requests if r[1] == "simulations/data"]
+    assert len(requests) == 1
+    assert len(requests[0][2]["simids"]) == 10
+
+
+def test_wait_all_timeout():
+    server = FakeSimulations()
+    client = FakeClient(server.handlers())
+    server.progress.update({"done": 100, "running": 50})
+    simulations = [
+        Simulation(client, "pid", "tid", simid, simid, 0) for simid in server.progress
+    ]
+    with pytest.raises(TimeoutError):
+        client.simulations.wait_all(simulations, timeout=0.2)
+
+    # The simulation that timed out is dropped on the next tick
+    poller = client.simulations._poller
+    for _ in range(100):
+        with poller._lock:
+            if not poller._pending:
+                break
+        time.sleep(0.01)
+    with poller._lock:
+        assert not poller._pending
+    count = client.count("POST", "simulations/data")
+    time.sleep(0.2)
+    assert client.count("POST", "simulations/data") == count
+
+
+def test_diff_all():
+    server = FakeSimulations()
+    client = FakeClient(server.handlers())
+    baseline = Simulation(client, "pid", "tid", "baseline", "baseline", 100)
+    server.risks["baseline"] = [get_risk(1, 0.5), get_risk(2, 0.0)]
+    simulations = []
+    for i in range(3):
+        simid = f"simulation{i}"
+        server.risks[simid] = [get_risk(1, 0.5), get_risk(2, 0.1 * (i + 1))]
+        simulations.append(Simulation(client, "pid", "tid", simid, simid, 100))
+    diffs = client.simulations.diff_all([(baseline, s) for s in simulations])
+    assert len(diffs) == 3
+    for i, diff in enumerate(diffs):
+        assert [a["object_id"] for a in diff["newly_reachable"]] == ["2"]
+        assert diff["total_risk_delta"] == pytest.approx(0.1 * (i + 1) * 5)
+    # The results of each simulation are fetched once
+    fetched = [r[2]["simid"] for r in client.requests if r[1] == "simulation/data"]
+    assert sorted(fetched) == ["baseline", "simulation0", "simulation1", "simulation2"]
+
+
+def get_stepping_client(steps):
+    """Returns a client whose simulation advances one step per poll."""
+    server = FakeSimulations()
+    client = FakeClient(server.handlers())
+    steps = iter(steps)
+
+    def simulations_data(data):
+        server.progress["simid"] = next(steps, server.progress["simid"])
+        return server.simulations_data(data)
+
+    server.progress["simid"] = 0
+    client.handlers[("POST", "simulations/data")] = simulations_data
+    return client, Simulation(client, "pid", "tid", "simid", "simid", 0)
+
+
+def wait_until_not_polled(client):
+    poller = client.simulations._poller
+    for _ in range(100):
+        with poller._lock:
+            if not poller._pending and not poller._listeners:
+                return
+        time.sleep(0.01)
+    raise AssertionError("Simulation is still polled")
+
+
+def test_simulation_watch():
+    client, simulation = get_stepping_client([10, 10, 50, 100])
+    assert list(simulation.watch()) == [10, 50, 100]
+    assert simulation.progress == 100
+
+
+def test_simulation_watch_break():
+    client, simulation = get_stepping_client([10, 20, 30, 40, 50])
+    progresses = simulation.watch()
+    for progress in progresses:
+        assert progress == 10
+        break
+    progresses.close()
+    wait_until_not_polled(client)
+
+
+def test_simulation_awatch():
+    client, simulation = get_stepping_client([10, 50, 100])
+
+    async def watch():
+        return [progress async for progress in simulation.awatch()]
+
+    assert asyncio.run(watch()) == [10, 50, 100]
+
+    client, simulation = get_stepping_client([10, 20, 30, 40, 50])
+
+    async def watch_break():
+        progresses = simulation.awatch()
+        async for progress in progresses:
+            assert progress == 10
+            break
+        await progresses.aclose()
+
+    asyncio.run(watch_break())
+    wait_until_not_polled(client)
+
+
+def test_simulation_watch_callback():
+    client, simulation = get_stepping_client([-1])
+    calls = []
+    future = simulation.watch_callback(lambda s, p: calls.append((s, p)))
+    assert future.result(timeout=5) == -1
+    assert calls == [(simulation, -1)]
+
+
+def test_create_simulation_requests():
+    server = FakeSimulations()
+    client = FakeClient(server.handlers())
+    scenario = Scenario(client, "pid", "tid", "scenario", "")
+    simulation = client.simulations.create_simulation(scenario)
+    assert [r[:2] for r in client.requests] == [("PUT", "simulation")]
+
+    # The name and progress are fetched together on first access
+    assert simulation.name == simulation.simid
+    assert simulation.progress == 100
+    assert [r[:2] for r in client.requests[1:]] == [("POST", "simulations/data")]
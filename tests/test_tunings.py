@@ -16,6 +16,7 @@ import sys
 from pathlib import Path
 
 import pytest
+from securicad.model import Model
 
 import utils
 
@@ -23,7 +24,7 @@ import utils
 
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 from securicad.enterprise.exceptions import StatusCodeException
-from securicad.enterprise.tunings import Tunings
+from securicad.enterprise.tunings import Tunings, _ObjectIndex
 
 # isort: on
 
@@ -173,6 +174,28 @@ def test_convert_ttc_object(data, project, model):
     assert converted == oldformat
 
 
+def test_object_index_ambiguous_name(data):
+    model = Model(
+        {
+            "objects": {
+                "1": {"eid": 1, "name": "a", "metaconcept": "EC2Instance"},
+                "2": {"eid": 2, "name": "a", "metaconcept": "S3Bucket"},
+                "3": {"eid": 3, "name": "b", "metaconcept": "S3Bucket"},
+                "4": {"eid": 4, "name": "b", "metaconcept": "S3Bucket"},
+            }
+        }
+    )
+    object_index = _ObjectIndex(model)
+    assert object_index.find_object("a", "EC2Instance") == 1
+    assert object_index.find_object("a", "S3Bucket") == 2
+    with pytest.raises(ValueError, match="none of the supplied type"):
+        object_index.find_object("a", "IAMRole")
+    with pytest.raises(ValueError, match="found of the supplied type"):
+        object_index.find_object("b", "S3Bucket")
+    with pytest.raises(ValueError, match="not found"):
+        object_index.find_object("c", None)
+
+
 def verify_tuning_response(
     tuning_data,
     project,
@@ -858,3 +881,107 @@ def test_list(client, project, model):
     )
     curr_tunings = project.list_tunings()
     assert len(curr_tunings) == 1, curr_tunings
+
+
+def test_create_tunings(client, project, model):
+    tunings = client.tunings.create_tunings(
+        project,
+        model,
+        specs=[
+            {
+                "tuning_type": "ttc",
+                "op": "apply",
+                "filterdict": {
+                    "attackstep": "HighPrivilegeAccess",
+                    "object_name": "i-1",
+                },
+                "ttc": "Exponential,3",
+            },
+            {
+                "tuning_type": "tag",
+                "op": "apply",
+                "filterdict": {"metaconcept": "EC2Instance"},
+                "tags": {"a": "b"},
+            },
+        ],
+        chunk_size=1,
+    )
+    assert len(tunings) == 2, tunings
+    verify_tuning_response(
+        tunings[0],
+        project=project,
+        attackstep="HighPrivilegeAccess",
+        id_=151,
+        name="i-1",
+        scope="object",
+        ttc="Exponential,3",
+    )
+    verify_tuning_response(
+        tunings[1],
+        project=project,
+        id_="EC2Instance",
+        scope="class",
+        tag="a",
+        value="b",
+    )
+    assert len(project.list_tunings()) == 2
+
+
+def test_sync(client, project, model):
+    ttc_spec = {
+        "tuning_type": "ttc",
+        "op": "apply",
+        "filterdict": {"attackstep": "HighPrivilegeAccess", "object_name": "i-1"},
+        "ttc": "Exponential,3",
+    }
+    tag_spec = {
+        "tuning_type": "tag",
+        "op": "apply",
+        "filterdict": {"metaconcept": "EC2Instance"},
+        "tags": {"a": "b"},
+    }
+    tuning = client.tunings.create_tuning(project, model, **ttc_spec)
+    tunings = client.tunings.sync(project, model, [tag_spec, ttc_spec])
+    assert len(tunings) == 2, tunings
+    assert tunings[1].tuning_id == tuning.tuning_id
+    assert len(project.list_tunings()) == 2
+
+    tunings = client.tunings.sync(project, model, [tag_spec])
+    assert len(tunings) == 1, tunings
+    assert [t.tuning_id for t in project.list_tunings()] == [tunings[0].tuning_id]
+
+    assert client.tunings.sync(project, model, []) == []
+    assert project.list_tunings() == []
+
+
+def test_validate_tunings(client):
+    client.tunings.validate_tunings(
+        [
+            {
+                "tuning_type": "ttc",
+                "op": "apply",
+                "filterdict": {"metaconcept": "EC2Instance", "attackstep": "Connect"},
+                "ttc": "Exponential,3",
+            }
+        ]
+    )
+    with pytest.raises(ValueError) as e:
+        client.tunings.validate_tunings(
+            [
+                {
+                    "tuning_type": "ttc",
+                    "op": "apply",
+                    "filterdict": {"metaconcept": "EC2Instance", "attackstep": "Foo"},
+                },
+                {"tuning_type": "foo", "op": "apply", "filterdict": {}},
+                {
+                    "tuning_type": "tag",
+                    "op": "apply",
+                    "filterdict": {"metaconcept": "Foo"},
+                },
+            ]
+        )
+    message = str(e.value)
+    assert "specs[0]: Unknown attackstep='Foo'" in message, message
+    assert "specs[1]: Unknown tuning_type='foo'" in message, message
+    assert "specs[2]: Unknown metaconcept='Foo'" in message, message
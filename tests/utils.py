@@ -15,7 +15,7 @@
 import json
 import sys
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 from urllib.parse import urljoin
 
 import conftest
@@ -26,6 +26,8 @@ sys.path.append(str(Path(__file__).resolve().parent.parent))
 import securicad.enterprise
 
 if TYPE_CHECKING:
+    from _pytest.monkeypatch import MonkeyPatch
+
     from securicad.enterprise import AccessLevel, Client, Organization, Project, User
     from securicad.enterprise.exceptions import StatusCodeException
 
@@ -68,6 +70,19 @@ def get_client_sysadmin() -> "Client":
     return get_client(conftest.ADMIN_USERNAME, conftest.ADMIN_PASSWORD)
 
 
+def record_request_urls(client: "Client", monkeypatch: "MonkeyPatch") -> List[str]:
+    """Returns a list that the url of every request of ``client`` is appended to."""
+    urls: List[str] = []
+    request = client._session.request
+
+    def record_request(method: str, url: str, **kwargs: Any) -> Any:
+        urls.append(url)
+        return request(method, url, **kwargs)
+
+    monkeypatch.setattr(client._session, "request", record_request)
+    return urls
+
+
 def assert_access_token(client: "Client") -> None:
     assert client._get_access_token() is not None, "Missing access token in client"
 
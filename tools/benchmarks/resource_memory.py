@@ -0,0 +1,94 @@
+# Copyright 2020-2021 Foreseeti AB <https://foreseeti.com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measures the memory used by a synthetic inventory of resource objects.
+
+The inventory is created twice, once with the slotted resource classes and
+once with equivalent classes that store their attributes in a per-instance
+``__dict__``, and the memory allocated for each is printed.
+
+Usage: python tools/benchmarks/resource_memory.py [number-of-objects]
+"""
+
+import sys
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+# isort: off
+
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+from securicad.enterprise import (
+    AccessLevel,
+    ModelInfo,
+    Organization,
+    Project,
+    Role,
+    Scenario,
+    Simulation,
+    User,
+)
+from securicad.enterprise.tunings import Tuning
+
+# isort: on
+
+CLASSES = [Project, ModelInfo, Scenario, Simulation, Tuning, User, Organization]
+
+
+def get_factories(classes: Dict[str, type]) -> List[Callable[[int], Any]]:
+    project = classes["Project"](None, "pid", "project", "", AccessLevel.USER)
+    return [
+        lambda i: classes["Project"](
+            None, f"p{i}", f"project {i}", "", AccessLevel.USER
+        ),
+        lambda i: classes["ModelInfo"](
+            None, "pid", f"m{i}", f"model {i}", "", 100, 1000, {}, True, ""
+        ),
+        lambda i: classes["Scenario"](None, "pid", f"t{i}", f"scenario {i}", ""),
+        lambda i: classes["Simulation"](None, "pid", "tid", f"s{i}", f"sim {i}", 100),
+        lambda i: classes["Tuning"](None, project, f"c{i}", "any", "Exponential,3"),
+        lambda i: classes["User"](
+            None, i, f"user{i}@example.com", "first", "last", Role.USER, None
+        ),
+        lambda i: classes["Organization"](None, f"o{i}", f"organization {i}"),
+    ]
+
+
+def measure(classes: Dict[str, type], count: int) -> int:
+    factories = get_factories(classes)
+    tracemalloc.start()
+    inventory = [factories[i % len(factories)](i) for i in range(count)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del inventory
+    return size
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    slotted = {cls.__name__: cls for cls in CLASSES}
+    unslotted = {
+        cls.__name__: type(cls.__name__, (), {"__init__": cls.__init__})
+        for cls in CLASSES
+    }
+    dict_size = measure(unslotted, count)
+    slots_size = measure(slotted, count)
+    print(f"objects:   {count}")
+    print(f"__dict__:  {dict_size / 2**20:.1f} MiB")
+    print(f"__slots__: {slots_size / 2**20:.1f} MiB")
+    print(f"reduction: {1 - slots_size / dict_size:.0%}")
+
+
+if __name__ == "__main__":
+    main()